@@ -6,9 +6,14 @@ configuration data. It supports both INI-style configuration files
 and dictionary-based configuration.
 """
 
+import os
 from abc import ABC, abstractmethod
-from configparser import ConfigParser
-from typing import Any, Dict
+from configparser import ConfigParser, InterpolationError
+from functools import lru_cache
+from typing import Any, Dict, Optional, Union
+
+# An option's value, or the error raised when interpolating it
+_Value = Union[str, InterpolationError]
 
 
 class ConfigProvider(ABC):
@@ -19,6 +24,8 @@ class ConfigProvider(ABC):
     allowing for different types of configuration sources to be used.
     """
 
+    __slots__ = ()
+
     @abstractmethod
     def get(self, section: str, key: str, fallback: Any = None) -> Any:
         """
@@ -57,14 +64,120 @@ class ConfigProvider(ABC):
         pass
 
 
+def _interpolate_section(parser: ConfigParser, section: str) -> Dict[str, _Value]:
+    """
+    Interpolate every option of a section into a plain dictionary.
+
+    An option that cannot be interpolated is stored as the error it raised,
+    so that the error only surfaces if that option is read. The parser's
+    default section is interpolated like any other section.
+
+    Parameters
+    ----------
+    parser : ConfigParser
+        The parser holding the section.
+    section : str
+        The section name.
+
+    Returns
+    -------
+    Dict[str, str or InterpolationError]
+        The interpolated values, keyed by option name.
+    """
+    if section == parser.default_section:
+        options = list(parser.defaults())
+    else:
+        options = parser.options(section)
+    values: Dict[str, _Value] = {}
+    for option in options:
+        try:
+            values[option] = parser.get(section, option)
+        except InterpolationError as e:
+            values[option] = e
+    return values
+
+
+def _flatten(parser: ConfigParser) -> Dict[str, Dict[str, _Value]]:
+    """
+    Interpolate every section of a parser, including the default section,
+    into a plain dictionary.
+
+    Parameters
+    ----------
+    parser : ConfigParser
+        The parser to flatten.
+
+    Returns
+    -------
+    Dict[str, Dict[str, str or InterpolationError]]
+        The interpolated values, keyed by section and option name.
+    """
+    sections = [parser.default_section] + parser.sections()
+    return {section: _interpolate_section(parser, section) for section in sections}
+
+
+@lru_cache(maxsize=32)
+def _parse_ini(path: str, size: int, mtime_ns: int) -> Dict[str, Dict[str, _Value]]:
+    """
+    Parse an INI file into a plain dictionary.
+
+    The size and modification time are only used as part of the cache key,
+    so that a file edited since it was last parsed is parsed again.
+
+    Parameters
+    ----------
+    path : str
+        Absolute path to the INI file.
+    size : int
+        Size of the file in bytes.
+    mtime_ns : int
+        Modification time of the file in nanoseconds.
+
+    Returns
+    -------
+    Dict[str, Dict[str, str or InterpolationError]]
+        The interpolated values, keyed by section and option name.
+    """
+    parser = ConfigParser()
+    parser.read(path)
+    return _flatten(parser)
+
+
+def _load_ini(config_file: str) -> Dict[str, Dict[str, _Value]]:
+    """
+    Load an INI file, reusing the parsed result while the file is unchanged.
+
+    Parameters
+    ----------
+    config_file : str
+        Path to the INI file.
+
+    Returns
+    -------
+    Dict[str, Dict[str, str or InterpolationError]]
+        The interpolated values, keyed by section and option name. Empty if
+        the file does not exist.
+    """
+    path = os.path.abspath(config_file)
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return {}
+    return _parse_ini(path, st.st_size, st.st_mtime_ns)
+
+
 class IniConfigProvider(ConfigProvider):
     """
     Configuration provider that reads from an INI file.
 
     This class implements the ConfigProvider interface for INI-style
-    configuration files.
+    configuration files. The file is parsed and interpolated once, into a
+    plain dictionary that `get` reads from. Parsed files are cached for as
+    long as their size and modification time do not change.
     """
 
+    __slots__ = ("_config_file", "_parser", "_values")
+
     def __init__(self, config_file: str):
         """
         Initialize the IniConfigProvider.
@@ -74,8 +187,27 @@ class IniConfigProvider(ConfigProvider):
         config_file : str
             Path to the INI configuration file.
         """
-        self.config = ConfigParser()
-        self.config.read(config_file)
+        self._config_file = config_file
+        self._parser: Optional[ConfigParser] = None
+        self._values = {
+            section: dict(options)
+            for section, options in _load_ini(config_file).items()
+        }
+
+    @property
+    def config(self) -> ConfigParser:
+        """
+        The underlying ConfigParser, created the first time it is needed.
+
+        Returns
+        -------
+        ConfigParser
+            The parser holding the INI file and any values set since.
+        """
+        if self._parser is None:
+            self._parser = ConfigParser()
+            self._parser.read(self._config_file)
+        return self._parser
 
     def get(self, section: str, key: str, fallback: Any = None) -> Any:
         """
@@ -94,8 +226,16 @@ class IniConfigProvider(ConfigProvider):
         -------
         Any
             The configuration value if found, otherwise the fallback value.
+
+        Raises
+        ------
+        configparser.InterpolationError
+            If the value refers to other values that cannot be interpolated.
         """
-        return self.config.get(section, key, fallback=fallback)
+        value = self._values.get(section, {}).get(key.lower(), fallback)
+        if isinstance(value, InterpolationError):
+            raise value
+        return value
 
     def set(self, section: str, key: str, value: Any) -> None:
         """
@@ -113,6 +253,7 @@ class IniConfigProvider(ConfigProvider):
         if not self.config.has_section(section):
             self.config.add_section(section)
         self.config.set(section, key, str(value))
+        self._values[section] = _interpolate_section(self.config, section)
 
 
 class DictConfigProvider(ConfigProvider):
@@ -123,6 +264,8 @@ class DictConfigProvider(ConfigProvider):
     configuration.
     """
 
+    __slots__ = ("config",)
+
     def __init__(self, config_dict: Dict[str, Dict[str, Any]]):
         """
         Initialize the DictConfigProvider.
@@ -2,6 +2,8 @@
 Custom exceptions for the GitMirror library.
 """
 
+from typing import Any, Dict, List, Optional
+
 
 class GitMirrorError(Exception):
     """Base exception class for GitMirror errors."""
@@ -16,3 +18,12 @@ class MirrorError(GitMirrorError):
         self.message = message
         self.original_error = original_error
         super().__init__(self.message)
+
+
+class ProviderError(GitMirrorError):
+    """Exception raised for errors reported in a Git provider's API response."""
+
+    def __init__(self, message: str, errors: Optional[List[Dict[str, Any]]] = None):
+        self.message = message
+        self.errors = errors or []
+        super().__init__(self.message)
@@ -5,37 +5,52 @@ This module serves as the entry point for the Git Mirror application.
 It orchestrates the setup of components and execution of the mirroring process.
 
 The application can also create a pull request if configured to do so.
+
+The Git provider and mirror service modules pull in `requests`, so they are
+imported inside the functions that use them to keep CLI startup fast.
 """
 
-import argparse
 import json
 import sys
+from types import SimpleNamespace
 from typing import Any, Dict, Optional
 
 from gitmirror.config import DictConfigProvider, IniConfigProvider
 from gitmirror.exceptions import MirrorError
 from gitmirror.operations.file import FileCache, FileTreeHandler
 from gitmirror.operations.git import GitOperations
-from gitmirror.providers import GitProviderFactory, PullRequestInfo
-from gitmirror.services.mirror import MirrorService
 
 
-def parse_arguments() -> argparse.Namespace:
+def parse_arguments() -> SimpleNamespace:
     """
     Parse command-line arguments.
 
+    The common invocations (no arguments, or only the configuration file)
+    are handled directly; anything else, including `--help`, goes through
+    `argparse`, which is only imported then.
+
     Returns
     -------
-    argparse.Namespace
+    SimpleNamespace
         Parsed command-line arguments.
     """
+    argv = sys.argv[1:]
+    if not argv:
+        return SimpleNamespace(config="config.ini")
+    if len(argv) == 1 and argv[0].startswith("--config="):
+        return SimpleNamespace(config=argv[0][len("--config=") :])
+    if len(argv) == 2 and argv[0] in ("-c", "--config") and argv[1][:1] != "-":
+        return SimpleNamespace(config=argv[1])
+
+    import argparse
+
     parser = argparse.ArgumentParser(
         description="Git Mirror - Sync file trees with Git repositories"
     )
     parser.add_argument(
         "-c", "--config", default="config.ini", help="Path to the configuration file"
     )
-    return parser.parse_args()
+    return SimpleNamespace(**vars(parser.parse_args(argv)))
 
 
 def setup_components(config: Any) -> tuple:
@@ -53,11 +68,20 @@ def setup_components(config: Any) -> tuple:
         A tuple containing the initialized components:
         (file_tree_handler, git_provider)
     """
+    from gitmirror.providers import GitProviderFactory
+
     file_cache = FileCache(
         config.get("Cache", "cache_file", fallback="file_cache.json")
     )
     git_ops = GitOperations()
-    file_tree_handler = FileTreeHandler(file_cache, git_ops)
+    ignore_patterns = config.get("Filters", "ignore_patterns", fallback="").split(",")
+    threads = config.get("Mirror", "threads", fallback=None)
+    file_tree_handler = FileTreeHandler(
+        file_cache,
+        git_ops,
+        ignore_patterns=ignore_patterns,
+        max_workers=int(threads) if threads else None,
+    )
 
     git_provider = GitProviderFactory.get_provider(
         config.get("Repository", "git_server"), config.get("Repository", "repository")
@@ -82,6 +106,8 @@ def create_pull_request(config: Any, git_provider: Any) -> Dict[str, Any]:
     Dict[str, Any]
         The result of the pull request creation.
     """
+    from gitmirror.providers import PullRequestInfo
+
     pr_info = PullRequestInfo(
         title=config.get("PullRequest", "title"),
         description=config.get("PullRequest", "description"),
@@ -116,6 +142,8 @@ def run_mirror_process(
     Dict[str, Any]
         The result of the mirroring process and pull request creation (if applicable).
     """
+    from gitmirror.services.mirror import MirrorService
+
     mirror_service = MirrorService(config, file_tree_handler, git_provider)
     result = mirror_service.mirror_file_tree()
 
@@ -155,6 +183,8 @@ def mirror(config_path: Optional[str] = None, **config_params) -> Dict[str, Any]
     Exception
         If an error occurs during the process.
     """
+    from gitmirror.services.mirror import MirrorService
+
     try:
         if config_path:
             config = IniConfigProvider(config_path)
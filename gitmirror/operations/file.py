@@ -5,17 +5,179 @@ This module provides classes for handling file-related operations,
 including file caching and file tree handling.
 """
 
+import atexit
 import json
 import os
+import re
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Pattern,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None  # type: ignore[assignment]
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def _glob_to_regex(pattern: str) -> str:
+    """
+    Translate a glob pattern into a regular expression.
+
+    The expression follows `PurePath.match` semantics: wildcards never match
+    across a path separator, and relative patterns are matched against the
+    end of the path.
+
+    Parameters
+    ----------
+    pattern : str
+        Glob pattern, using ``/`` as the separator.
+
+    Returns
+    -------
+    str
+        Regular expression source equivalent to the pattern.
+    """
+    i, n = 0, len(pattern)
+    parts = ["^" if pattern.startswith("/") else "(?:^|/)"]
+    while i < n:
+        char = pattern[i]
+        i += 1
+        if char == "*":
+            parts.append("[^/]*")
+        elif char == "?":
+            parts.append("[^/]")
+        elif char == "[":
+            j = i
+            if j < n and pattern[j] == "!":
+                j += 1
+            if j < n and pattern[j] == "]":
+                j += 1
+            j = pattern.find("]", j)
+            if j == -1:
+                parts.append("\\[")
+            else:
+                chars = pattern[i:j].replace("\\", "\\\\")
+                i = j + 1
+                if chars.startswith("!"):
+                    chars = "^" + chars[1:]
+                elif chars.startswith("^"):
+                    chars = "\\" + chars
+                parts.append(f"[{chars}]")
+        else:
+            parts.append(re.escape(char))
+    parts.append("\\Z")
+    return "".join(parts)
+
+
+@lru_cache(maxsize=32)
+def _compile_ignore_patterns(
+    ignore_patterns: Tuple[str, ...],
+) -> Optional[Pattern[str]]:
+    """
+    Compile glob patterns into a single regular expression.
+
+    Results are cached, so handlers created with the same patterns share
+    one compiled expression.
+
+    Parameters
+    ----------
+    ignore_patterns : tuple of str
+        Glob patterns. Surrounding whitespace is stripped and empty
+        patterns are skipped.
+
+    Returns
+    -------
+    re.Pattern or None
+        Expression matching any of the patterns, or None if there are none.
+    """
+    regexes = [_glob_to_regex(p.strip()) for p in ignore_patterns if p.strip()]
+    if not regexes:
+        return None
+    return re.compile("|".join(f"(?:{regex})" for regex in regexes))
+
+
+def _iter_files(
+    root: str, ignore: Optional[Callable[[str], bool]] = None
+) -> Iterator[Tuple[str, os.stat_result]]:
+    """
+    Recursively yield the files below a directory.
+
+    The tree is walked with an explicit stack of `os.scandir` calls, so file
+    and directory types come straight from the directory listing instead of
+    costing a `stat` per entry. Symbolic links to directories are not
+    followed.
+
+    Parameters
+    ----------
+    root : str
+        Directory to walk.
+    ignore : callable, optional
+        Predicate called with the path of each file; files for which it
+        returns True are skipped without a `stat`.
+
+    Yields
+    ------
+    tuple of (str, os.stat_result)
+        Path of each file relative to `root`, and its stat result.
+    """
+    prefix_len = len(os.path.join(root, ""))
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file() and not (ignore and ignore(entry.path)):
+                    yield entry.path[prefix_len:], entry.stat()
+
+
+# File caches that have not been garbage collected, flushed at exit
+_live_caches: "weakref.WeakSet[FileCache]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_live_caches() -> None:
+    """
+    Write the pending updates of every live file cache.
+
+    Registered once with `atexit` as a safety net for caches that were not
+    flushed explicitly. The caches are only referenced weakly, so this does
+    not keep them alive.
+    """
+    for cache in list(_live_caches):
+        cache.flush()
 
 
 class FileCache:
     """
     A class for caching file hashes to track changes between operations.
+
+    Each entry also records the size and modification time the file had
+    when it was hashed, so unchanged files can be recognised from a `stat`
+    alone, without reading them again.
     """
 
+    __slots__ = ("cache_file", "cache", "_dirty", "__weakref__")
+
+    CACHE_VERSION = 3
+
     def __init__(self, cache_file: str):
         """
         Initialize the FileCache.
@@ -27,29 +189,77 @@ class FileCache:
         """
         self.cache_file = cache_file
         self.cache = self._load_cache()
+        self._dirty = False
+        _live_caches.add(self)
 
-    def _load_cache(self) -> Dict[str, str]:
+    def _load_cache(self) -> Dict[str, Dict[str, Any]]:
         """
         Load the cache from the cache file.
 
+        The file is read in one call and parsed from bytes, with `orjson`
+        when installed. Caches written by older versions are discarded,
+        since their hashes were not Git blob hashes and cannot be compared
+        with the new ones.
+
         Returns
         -------
         dict
-            Dictionary containing the cached file hashes.
+            Dictionary mapping file paths to their cache entries.
         """
-        if os.path.exists(self.cache_file):
-            with open(self.cache_file, "r") as f:
-                return json.load(f)
-        return {}
+        try:
+            raw = Path(self.cache_file).read_bytes()
+        except FileNotFoundError:
+            return {}
+        data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+        if data.get("version") != self.CACHE_VERSION:
+            return {}
+        return data["files"]
 
     def _save_cache(self) -> None:
         """
         Save the current cache to the cache file.
+
+        The cache is written to a temporary file first and then moved into
+        place, so an interrupted write never leaves a truncated cache behind.
+        It is serialized with `orjson` when installed, and the standard
+        library `json` module otherwise.
+        """
+        data = {"version": self.CACHE_VERSION, "files": self.cache}
+        if orjson is not None:
+            payload = orjson.dumps(data)
+        else:
+            payload = json.dumps(data, separators=(",", ":")).encode()
+        tmp_file = f"{self.cache_file}.tmp"
+        with open(tmp_file, "wb") as f:
+            f.write(payload)
+        os.replace(tmp_file, self.cache_file)
+
+    def flush(self) -> None:
+        """
+        Write pending hash updates to the cache file, if there are any.
+        """
+        if self._dirty:
+            self._save_cache()
+            self._dirty = False
+
+    def retain(self, file_paths: Iterable[str]) -> None:
+        """
+        Drop the entries of all files not in `file_paths`.
+
+        The removal is kept in memory until `flush` is called.
+
+        Parameters
+        ----------
+        file_paths : iterable of str
+            Paths of the files whose entries are kept.
         """
-        with open(self.cache_file, "w") as f:
-            json.dump(self.cache, f)
+        stale = self.cache.keys() - set(file_paths)
+        for file_path in stale:
+            del self.cache[file_path]
+        if stale:
+            self._dirty = True
 
-    def get_hash(self, file_path: str) -> str:
+    def get_hash(self, file_path: str) -> Optional[str]:
         """
         Get the cached hash for a file.
 
@@ -63,21 +273,62 @@ class FileCache:
         str or None
             The cached hash if found, otherwise None.
         """
-        return self.cache.get(file_path)
+        entry = self.cache.get(file_path)
+        return entry["h"] if entry else None
+
+    def lookup(self, file_path: str, size: int, mtime_ns: int) -> Optional[str]:
+        """
+        Get the cached hash for a file, if the file has not changed since.
+
+        Parameters
+        ----------
+        file_path : str
+            Path to the file.
+        size : int
+            Current size of the file in bytes.
+        mtime_ns : int
+            Current modification time of the file in nanoseconds.
+
+        Returns
+        -------
+        str or None
+            The cached hash if the size and modification time match the
+            cached ones, otherwise None.
+        """
+        entry = self.cache.get(file_path)
+        if entry and entry.get("s") == size and entry.get("m") == mtime_ns:
+            return entry["h"]
+        return None
 
-    def update_hash(self, file_path: str, file_hash: str) -> None:
+    def update_hash(
+        self,
+        file_path: str,
+        file_hash: str,
+        size: Optional[int] = None,
+        mtime_ns: Optional[int] = None,
+    ) -> None:
         """
         Update the cached hash for a file.
 
+        The update is kept in memory until `flush` is called.
+
         Parameters
         ----------
         file_path : str
             Path to the file.
         file_hash : str
             New hash value for the file.
+        size : int, optional
+            Size of the file in bytes when it was hashed.
+        mtime_ns : int, optional
+            Modification time of the file in nanoseconds when it was hashed.
         """
-        self.cache[file_path] = file_hash
-        self._save_cache()
+        entry: Dict[str, Any] = {"h": file_hash}
+        if size is not None and mtime_ns is not None:
+            entry["s"] = size
+            entry["m"] = mtime_ns
+        self.cache[file_path] = entry
+        self._dirty = True
 
 
 class FileTreeHandler:
@@ -85,7 +336,15 @@ class FileTreeHandler:
     A class for handling file tree operations including copying and change detection.
     """
 
-    def __init__(self, file_cache: FileCache, git_ops):
+    __slots__ = ("file_cache", "git_ops", "max_workers", "_ignore_re")
+
+    def __init__(
+        self,
+        file_cache: FileCache,
+        git_ops,
+        ignore_patterns: Optional[List[str]] = None,
+        max_workers: Optional[int] = None,
+    ):
         """
         Initialize the FileTreeHandler.
 
@@ -95,90 +354,243 @@ class FileTreeHandler:
             FileCache object for tracking file changes.
         git_ops : GitOperations
             GitOperations object for Git-related file operations.
+        ignore_patterns : list of str, optional
+            List of glob patterns for files `copy_file_tree` should not copy.
+        max_workers : int, optional
+            Number of threads used to hash and copy files. Defaults to the
+            `ThreadPoolExecutor` default; 1 disables threading.
         """
         self.file_cache = file_cache
         self.git_ops = git_ops
+        self.max_workers = max_workers
+        self._ignore_re = _compile_ignore_patterns(tuple(ignore_patterns or ()))
 
-    def should_ignore(self, file_path: str, ignore_patterns: List[str]) -> bool:
+    def _map(self, func: Callable[[T], R], items: Iterable[T]) -> List[R]:
         """
-        Check if a file should be ignored based on ignore patterns.
+        Apply a function to every item, using a thread pool if enabled.
+
+        Hashing and copying are I/O bound and hashlib releases the GIL, so
+        running them in threads overlaps the waits on disk.
 
         Parameters
         ----------
-        file_path : str
+        func : callable
+            Function to apply.
+        items : iterable
+            Items to apply the function to.
+
+        Returns
+        -------
+        list
+            The results, in the same order as `items`.
+        """
+        if self.max_workers == 1:
+            return [func(item) for item in items]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return list(executor.map(func, items))
+
+    def should_ignore(self, file_path: Union[str, Path]) -> bool:
+        """
+        Check if a file should be ignored based on the ignore patterns.
+
+        All patterns are compiled into one regular expression up front, so
+        this is a single match per file.
+
+        Parameters
+        ----------
+        file_path : str or Path
             Path to the file.
-        ignore_patterns : list of str
-            List of glob patterns for files to ignore.
 
         Returns
         -------
         bool
             True if the file should be ignored, False otherwise.
         """
-        for pattern in ignore_patterns:
-            if Path(file_path).match(pattern):
-                return True
-        return False
+        if self._ignore_re is None:
+            return False
+        path = os.fspath(file_path)
+        if os.sep != "/":
+            path = path.replace(os.sep, "/")
+        return self._ignore_re.search(path) is not None
+
+    def hash_source_tree(self, src_dir: Path) -> Dict[str, str]:
+        """
+        Hash every file in the source directory that is not ignored.
+
+        The result can be passed to `detect_file_changes` and `copy_file_tree`
+        so that each source file is only hashed once per mirror run. Files
+        matching the handler's ignore patterns are skipped before they are
+        read. Files whose size and modification time match the file cache
+        are not read either; every file that is read is recorded in the
+        cache, entries of files no longer in the tree are dropped, and the
+        cache is then flushed.
+
+        Parameters
+        ----------
+        src_dir : Path
+            Source directory.
+
+        Returns
+        -------
+        dict
+            Dictionary mapping each file path, relative to `src_dir`, to its hash.
+        """
+        root = str(src_dir)
+        src_hashes = {}
+        to_hash = []
+        ignore = self.should_ignore if self._ignore_re is not None else None
+        for relative_path, st in _iter_files(root, ignore):
+            cached_hash = self.file_cache.lookup(
+                relative_path, st.st_size, st.st_mtime_ns
+            )
+            if cached_hash is None:
+                to_hash.append((relative_path, st))
+            else:
+                src_hashes[relative_path] = cached_hash
+
+        hashes = self._map(
+            self.git_ops.get_file_hash,
+            [os.path.join(root, path) for path, _ in to_hash],
+        )
+        for (relative_path, st), file_hash in zip(to_hash, hashes):
+            src_hashes[relative_path] = file_hash
+            self.file_cache.update_hash(
+                relative_path, file_hash, st.st_size, st.st_mtime_ns
+            )
+        self.file_cache.retain(src_hashes)
+        self.file_cache.flush()
+        return src_hashes
 
     def copy_file_tree(
-        self, src_dir: Path, dest_dir: Path, ignore_patterns: List[str]
+        self,
+        src_dir: Path,
+        dest_dir: Path,
+        src_hashes: Optional[Dict[str, str]] = None,
+        changes: Optional[Dict[str, str]] = None,
     ) -> None:
         """
         Copy the file tree from source to destination, updating only changed files.
 
+        The added and modified files listed in `changes` are copied, and the
+        deleted ones are removed from `dest_dir` so that the deletions are
+        committed too.
+
         Parameters
         ----------
         src_dir : Path
             Source directory.
         dest_dir : Path
-            Destination directory.
-        ignore_patterns : list of str
-            List of glob patterns for files to ignore.
-        """
-        for src_path in src_dir.rglob("*"):
-            if src_path.is_file() and not self.should_ignore(src_path, ignore_patterns):
-                relative_path = src_path.relative_to(src_dir)
-                dest_path = dest_dir / relative_path
-                current_hash = self.git_ops.get_file_hash(str(src_path))
-                cached_hash = self.file_cache.get_hash(str(relative_path))
-                if current_hash != cached_hash:
-                    dest_path.parent.mkdir(parents=True, exist_ok=True)
-                    self.git_ops.copy_file(src_path, dest_path)
-                    self.file_cache.update_hash(str(relative_path), current_hash)
-
-    def detect_file_changes(self, src_dir: Path, dest_dir: Path) -> Dict[str, str]:
+            Destination directory, a Git working tree.
+        src_hashes : dict, optional
+            Precomputed source hashes, as returned by `hash_source_tree`.
+            Only used to detect the changes when `changes` is not provided.
+        changes : dict, optional
+            Changes between the two directories, as returned by
+            `detect_file_changes`. Detected on the fly if not provided.
+        """
+        if changes is None:
+            changes = self.detect_file_changes(src_dir, dest_dir, src_hashes)
+
+        to_copy = []
+        for relative_path, change in changes.items():
+            if change != "deleted":
+                to_copy.append(relative_path)
+                continue
+            try:
+                os.remove(dest_dir / relative_path)
+            except FileNotFoundError:
+                pass
+
+        for parent in {(dest_dir / path).parent for path in to_copy}:
+            parent.mkdir(parents=True, exist_ok=True)
+        self._map(
+            lambda path: self.git_ops.copy_file(src_dir / path, dest_dir / path),
+            to_copy,
+        )
+
+    def detect_file_changes(
+        self,
+        src_dir: Path,
+        dest_dir: Path,
+        src_hashes: Optional[Dict[str, str]] = None,
+        delete_missing: bool = False,
+        folders: Optional[List[str]] = None,
+    ) -> Dict[str, str]:
         """
         Detect changes between source and destination directories.
 
+        `dest_dir` must be a freshly cloned Git working tree. The source
+        hashes are Git blob hashes, so they are compared directly with the
+        hashes recorded in the destination's index and no destination file
+        is read for files whose hashes match. A file whose index hash
+        differs is only reported as modified if its checked-out copy differs
+        too, since Git may convert files on checkout (line endings under
+        `core.autocrlf` or attributes, `ident` expansion, Git LFS and other
+        filters), in which case the index hash is not of the file on disk.
+        Files matching the handler's ignore patterns are left out.
+
         Parameters
         ----------
         src_dir : Path
             Source directory.
         dest_dir : Path
             Destination directory.
+        src_hashes : dict, optional
+            Precomputed source hashes, as returned by `hash_source_tree`.
+            Computed on the fly if not provided.
+        delete_missing : bool, optional
+            Whether files in the destination that are missing from the source
+            are reported as deleted (default is False).
+        folders : list of str, optional
+            Folders, relative to `dest_dir`, that are mirrored. Only missing
+            files below them are reported as deleted, so that files outside
+            the mirrored folders, such as the root files a cone-mode sparse
+            checkout always includes, are kept. Defaults to the whole tree.
 
         Returns
         -------
         dict
             Dictionary of changed files with their change types ('added', 'modified', or 'deleted').
         """
+        if src_hashes is None:
+            src_hashes = self.hash_source_tree(src_dir)
+        dest_hashes = self.git_ops.list_index_hashes(str(dest_dir))
         changes = {}
-        for src_path in src_dir.rglob("*"):
-            if src_path.is_file():
-                relative_path = src_path.relative_to(src_dir)
-                dest_path = dest_dir / relative_path
-                if not dest_path.exists():
-                    changes[str(relative_path)] = "added"
-                elif self.git_ops.get_file_hash(
-                    str(src_path)
-                ) != self.git_ops.get_file_hash(str(dest_path)):
-                    changes[str(relative_path)] = "modified"
-
-        for dest_path in dest_dir.rglob("*"):
-            if dest_path.is_file():
-                relative_path = dest_path.relative_to(dest_dir)
-                src_path = src_dir / relative_path
-                if not src_path.exists():
-                    changes[str(relative_path)] = "deleted"
+        for relative_path, src_hash in src_hashes.items():
+            if self.should_ignore(src_dir / relative_path):
+                continue
+            dest_hash = dest_hashes.get(relative_path)
+            if dest_hash is None:
+                changes[relative_path] = "added"
+            elif dest_hash != src_hash:
+                changes[relative_path] = "modified"
+
+        def working_tree_hash(relative_path: str) -> Optional[str]:
+            try:
+                return self.git_ops.get_file_hash(str(dest_dir / relative_path))
+            except FileNotFoundError:
+                return None
+
+        modified = [path for path, change in changes.items() if change == "modified"]
+        for relative_path, dest_hash in zip(
+            modified, self._map(working_tree_hash, modified)
+        ):
+            if dest_hash == src_hashes[relative_path]:
+                del changes[relative_path]
+
+        if not delete_missing:
+            return changes
+        prefixes = tuple(
+            os.path.join(os.path.normpath(folder.strip("/")), "")
+            for folder in folders or ()
+            if folder.strip("/")
+        )
+        for relative_path in dest_hashes:
+            if (
+                relative_path not in src_hashes
+                and (not prefixes or relative_path.startswith(prefixes))
+                and not self.should_ignore(src_dir / relative_path)
+            ):
+                changes[relative_path] = "deleted"
 
         return changes
@@ -10,7 +10,9 @@ import os
 import shutil
 import subprocess
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Optional
+
+HASH_CHUNK_SIZE = 1 << 20
 
 
 class GitOperations:
@@ -18,6 +20,8 @@ class GitOperations:
     A class for handling Git-related operations.
     """
 
+    __slots__ = ()
+
     @staticmethod
     def clone_repository(
         git_url: str,
@@ -55,11 +59,6 @@ class GitOperations:
         subprocess.run(
             ["git", "sparse-checkout", "init", "--cone"], cwd=temp_repo_path, check=True
         )
-        subprocess.run(
-            ["git", "sparse-checkout", "set"] + folders_to_include,
-            cwd=temp_repo_path,
-            check=True,
-        )
         if folders_to_include:
             subprocess.run(
                 ["git", "sparse-checkout", "set"] + folders_to_include,
@@ -71,13 +70,44 @@ class GitOperations:
                 ["git", "sparse-checkout", "disable"], cwd=temp_repo_path, check=True
             )
 
+    @staticmethod
+    def refresh_repository(repo_path: str, base_branch: str) -> None:
+        """
+        Bring an existing clone back in line with the remote branch.
+
+        Local commits and uncommitted or untracked files left over from a
+        previous run are discarded.
+
+        Parameters
+        ----------
+        repo_path : str
+            Path to the local repository.
+        base_branch : str
+            Name of the branch to reset to.
+        """
+        subprocess.run(
+            ["git", "fetch", "origin", base_branch], cwd=repo_path, check=True
+        )
+        subprocess.run(
+            ["git", "reset", "--hard", f"origin/{base_branch}"],
+            cwd=repo_path,
+            check=True,
+        )
+        subprocess.run(["git", "clean", "-fd"], cwd=repo_path, check=True)
+
     @staticmethod
     def push_changes(
-        temp_repo_path: str, commit_msg: str, new_branch: str = None
+        temp_repo_path: str,
+        commit_msg: str,
+        new_branch: str = None,
+        timeout: Optional[float] = None,
     ) -> str:
         """
         Commit and push changes to the repository.
 
+        When `new_branch` is given, the commit is pushed straight to that
+        remote branch; no local branch is created for it.
+
         Parameters
         ----------
         temp_repo_path : str
@@ -86,33 +116,80 @@ class GitOperations:
             Commit message.
         new_branch : str, optional
             Name of the new branch to create and push to.
+        timeout : float, optional
+            Seconds to wait for `git push` before giving up. Waits
+            indefinitely by default.
 
         Returns
         -------
         str
             The commit hash of the pushed changes.
         """
-        subprocess.run(["git", "add", "."], cwd=temp_repo_path, check=True)
+        subprocess.run(["git", "add", "-A"], cwd=temp_repo_path, check=True)
         subprocess.run(
             ["git", "commit", "-m", commit_msg], cwd=temp_repo_path, check=True
         )
-        if new_branch:
-            subprocess.run(
-                ["git", "checkout", "-b", new_branch], cwd=temp_repo_path, check=True
-            )
+        refspec = f"HEAD:refs/heads/{new_branch}" if new_branch else "HEAD"
         subprocess.run(
-            ["git", "push", "origin", new_branch or "HEAD"],
+            ["git", "push", "origin", refspec],
             cwd=temp_repo_path,
             check=True,
+            timeout=timeout,
         )
         return subprocess.check_output(
             ["git", "rev-parse", "HEAD"], cwd=temp_repo_path, universal_newlines=True
         ).strip()
 
+    @staticmethod
+    def list_index_hashes(repo_path: str) -> Dict[str, str]:
+        """
+        Read the blob hash of every checked-out file from the Git index.
+
+        Git already knows the hash of every tracked file, so this replaces
+        reading and hashing the working tree. Entries outside the sparse
+        checkout and submodules are left out, since neither is present as
+        a regular file in the working tree.
+
+        Parameters
+        ----------
+        repo_path : str
+            Path to the local repository.
+
+        Returns
+        -------
+        dict
+            Dictionary mapping each file path, relative to `repo_path`, to
+            its Git blob hash.
+        """
+        output = subprocess.check_output(
+            ["git", "ls-files", "--stage", "-t", "-z"], cwd=repo_path
+        )
+        hashes = {}
+        for record in output.decode("utf-8", "surrogateescape").split("\0"):
+            if not record:
+                continue
+            info, path = record.split("\t", 1)
+            tag, mode, blob_hash, _ = info.split(" ")
+            if tag == "S" or mode == "160000":
+                continue
+            if os.sep != "/":
+                path = path.replace("/", os.sep)
+            hashes[path] = blob_hash
+        return hashes
+
     @staticmethod
     def get_file_hash(file_path: str) -> str:
         """
-        Calculate the MD5 hash of a file.
+        Calculate the Git blob hash of a file.
+
+        This is the same SHA-1 that `git hash-object` computes, so source
+        files can be compared directly with the hashes in a repository's
+        index (see `list_index_hashes`).
+
+        On Python 3.11+ the file is hashed by `hashlib.file_digest`, which
+        reads and hashes in C without going through a Python-level loop.
+        Older versions read the file in `HASH_CHUNK_SIZE` chunks into a
+        single reusable buffer.
 
         Parameters
         ----------
@@ -122,29 +199,44 @@ class GitOperations:
         Returns
         -------
         str
-            MD5 hash of the file.
+            Git blob hash of the file.
         """
-        with open(file_path, "rb") as f:
-            file_hash = hashlib.md5()
-            chunk = f.read(8192)
-            while chunk:
-                file_hash.update(chunk)
-                chunk = f.read(8192)
+        with open(file_path, "rb", buffering=0) as f:
+            header = b"blob %d\0" % os.fstat(f.fileno()).st_size
+            if hasattr(hashlib, "file_digest"):
+                return hashlib.file_digest(f, lambda: hashlib.sha1(header)).hexdigest()
+            file_hash = hashlib.sha1(header)
+            buffer = bytearray(HASH_CHUNK_SIZE)
+            view = memoryview(buffer)
+            size = f.readinto(buffer)
+            while size:
+                file_hash.update(view[:size])
+                size = f.readinto(buffer)
         return file_hash.hexdigest()
 
     @staticmethod
-    def copy_file(src_path: Path, dest_path: Path) -> None:
+    def copy_file(src_path: Path, dest_path: Path, preserve_mode: bool = True) -> None:
         """
         Copy a file from source to destination.
 
+        Only the contents, and optionally the permission bits, are copied.
+        Git does not track timestamps or other metadata, so skipping them
+        saves syscalls and lets `shutil.copyfile` use the kernel's
+        zero-copy fast path where available.
+
         Parameters
         ----------
         src_path : Path
             Source file path.
         dest_path : Path
             Destination file path.
+        preserve_mode : bool, optional
+            Whether to copy the permission bits, which Git tracks for
+            executable files (default is True).
         """
-        shutil.copy2(src_path, dest_path)
+        shutil.copyfile(src_path, dest_path)
+        if preserve_mode:
+            shutil.copymode(src_path, dest_path)
 
     @staticmethod
     def create_rollback_commit(repo_path: Path, changes: dict) -> None:
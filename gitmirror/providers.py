@@ -4,22 +4,94 @@ Git provider module for Git Mirror.
 This module provides classes for interacting with various Git hosting services,
 including GitHub, GitLab, Bitbucket, AWS CodeCommit, and Azure DevOps.
 It also includes a factory class for creating provider instances based on
-the specified Git server.
+the specified Git server, and a helper for creating several pull requests
+concurrently.
 """
 
 import os
+import sys
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Any, Dict
+from functools import lru_cache, wraps
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Type, TypeVar
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
+from gitmirror.exceptions import ProviderError
 
-@dataclass
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None  # type: ignore[assignment]
+
+POOL_SIZE = 10
+POOL_HOSTS = 20
+# Seconds to wait for a connection and for each read of the response
+DEFAULT_TIMEOUT = (3.05, 27)
+RETRY = Retry(
+    total=3,
+    backoff_factor=1.0,
+    status_forcelist=(429, 500, 502, 503, 504),
+    allowed_methods=frozenset({"POST"}),
+    respect_retry_after_header=True,
+    raise_on_status=False,
+)
+
+P = TypeVar("P", bound="BaseProvider")
+
+
+def _create_session() -> requests.Session:
+    """
+    Create an HTTP session configured for the providers.
+
+    The session keeps up to `POOL_SIZE` connections to each of `POOL_HOSTS`
+    hosts and retries transient failures according to `RETRY`.
+
+    Returns
+    -------
+    requests.Session
+        A new session.
+    """
+    session = requests.Session()
+    session.mount(
+        "https://",
+        HTTPAdapter(
+            pool_connections=POOL_HOSTS, pool_maxsize=POOL_SIZE, max_retries=RETRY
+        ),
+    )
+    return session
+
+
+@lru_cache(maxsize=None)
+def get_session() -> requests.Session:
+    """
+    Get the HTTP session shared by all providers in the process.
+
+    Sharing one session means connections are pooled across providers and
+    repositories, and pooling and retries are configured in one place.
+
+    Returns
+    -------
+    requests.Session
+        The shared session, created on first use.
+    """
+    return _create_session()
+
+
+# Slotted dataclasses need Python 3.10+
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
 class PullRequestInfo:
     """
     Data class to hold pull request information.
 
+    Instances are immutable and hashable, so they can be used as cache keys.
+
     Attributes
     ----------
     title : str
@@ -44,15 +116,78 @@ class PullRequestInfo:
     rebase: bool = True
 
 
+def _pr_key(pr_info: PullRequestInfo) -> Tuple[str, str, str]:
+    """
+    Get the fields that identify a pull request within a repository.
+
+    Parameters
+    ----------
+    pr_info : PullRequestInfo
+        Information about the pull request.
+
+    Returns
+    -------
+    tuple
+        The head branch, base branch and title.
+    """
+    return (pr_info.head_branch, pr_info.base_branch, pr_info.title)
+
+
+def _idempotent(
+    create: Callable[[P, PullRequestInfo], Dict[str, Any]],
+) -> Callable[[P, PullRequestInfo], Dict[str, Any]]:
+    """
+    Decorate `create_pull_request` to create each pull request only once.
+
+    The response for each pull request is remembered by the provider, so
+    calling again with the same head branch, base branch and title returns
+    it without another request. Failed requests are not remembered.
+
+    Parameters
+    ----------
+    create : callable
+        The `create_pull_request` method to wrap.
+
+    Returns
+    -------
+    callable
+        The wrapped method.
+    """
+
+    @wraps(create)
+    def wrapper(self: P, pr_info: PullRequestInfo) -> Dict[str, Any]:
+        key = _pr_key(pr_info)
+        result = self._created.get(key)
+        if result is None:
+            result = self._created[key] = create(self, pr_info)
+        return result
+
+    return wrapper
+
+
 class BaseProvider(ABC):
     """
     Abstract base class for Git providers.
 
     This class defines the interface for Git providers, allowing
     for different Git hosting services to be supported.
+
+    Providers send their requests through a `requests.Session`, by default
+    the one shared by the whole process (see `get_session`), so consecutive
+    requests reuse pooled connections instead of opening a new TCP and TLS
+    connection every time. Rate-limited (429) and transient server error
+    responses, as well as connection errors, are retried with exponential
+    backoff according to `RETRY`, honouring any `Retry-After` header.
+    Providers can be used as context managers: inside the block, a
+    provider using the shared session sends its requests through a session
+    of its own, whose connections are closed when the block exits.
+
+    Pull requests are only created once per provider: asking again for
+    one with the same head branch, base branch and title returns the
+    response from the first time, until `invalidate` is called.
     """
 
-    def __init__(self, repository: str):
+    def __init__(self, repository: str, session: Optional[requests.Session] = None):
         """
         Initialize the BaseProvider.
 
@@ -60,8 +195,112 @@ class BaseProvider(ABC):
         ----------
         repository : str
             The name of the repository.
+        session : requests.Session, optional
+            Session to send requests with. Defaults to the shared session.
         """
         self.repository = repository
+        self._session = session if session is not None else get_session()
+        self._owns_session = False
+        self._created: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
+
+    def invalidate(self, pr_info: PullRequestInfo) -> None:
+        """
+        Forget a created pull request, so it can be created again.
+
+        Use this once the pull request has been merged or closed.
+
+        Parameters
+        ----------
+        pr_info : PullRequestInfo
+            Information about the pull request.
+        """
+        self._created.pop(_pr_key(pr_info), None)
+
+    def close(self) -> None:
+        """
+        Close the provider's own session, if it has one.
+
+        The provider goes back to the shared session. The shared session and
+        sessions passed in by the caller are left open, since other
+        providers may be using them.
+        """
+        if self._owns_session:
+            self._session.close()
+            self._session = get_session()
+            self._owns_session = False
+
+    def __enter__(self) -> "BaseProvider":
+        if self._session is get_session():
+            self._session = _create_session()
+            self._owns_session = True
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _post(
+        self, api_url: str, payload: Dict[str, Any], headers: Dict[str, str]
+    ) -> Dict[str, Any]:
+        """
+        Send a JSON POST request and return the decoded response.
+
+        Each attempt is bounded by `DEFAULT_TIMEOUT`; timed out attempts are
+        retried like other transient failures. The response body is parsed
+        with `orjson` when installed, straight from the raw bytes, and with
+        `Response.json` otherwise.
+
+        Parameters
+        ----------
+        api_url : str
+            The URL to post to.
+        payload : Dict[str, Any]
+            The JSON body of the request.
+        headers : Dict[str, str]
+            The request headers.
+
+        Returns
+        -------
+        Dict[str, Any]
+            The decoded JSON response.
+
+        Raises
+        ------
+        requests.exceptions.RequestException
+            If the request still fails after retrying.
+        """
+        response = self._session.post(
+            api_url, json=payload, headers=headers, timeout=DEFAULT_TIMEOUT
+        )
+        response.raise_for_status()
+        if orjson is not None:
+            return orjson.loads(response.content)
+        return response.json()
+
+    def create_pull_requests_bulk(
+        self, pr_infos: List[PullRequestInfo]
+    ) -> List[Dict[str, Any]]:
+        """
+        Create several pull requests.
+
+        Providers whose API has no way to create pull requests in bulk send
+        the requests concurrently, see `create_pull_requests`.
+
+        Parameters
+        ----------
+        pr_infos : List[PullRequestInfo]
+            Information about each pull request.
+
+        Returns
+        -------
+        List[Dict[str, Any]]
+            Details of the created pull requests, in the order of `pr_infos`.
+
+        Raises
+        ------
+        requests.exceptions.RequestException
+            If there's an error in the API requests.
+        """
+        return create_pull_requests([(self, pr_info) for pr_info in pr_infos])
 
     @abstractmethod
     def create_pull_request(self, pr_info: PullRequestInfo) -> Dict[str, Any]:
@@ -88,6 +327,187 @@ class GitHubProvider(BaseProvider):
     This class implements the BaseProvider interface for GitHub repositories.
     """
 
+    GRAPHQL_URL = "https://api.github.com/graphql"
+
+    def __init__(self, repository: str, session: Optional[requests.Session] = None):
+        """
+        Initialize the GitHubProvider.
+
+        The API URL and the authorization headers are computed once here,
+        reading the token from the environment, rather than on every request.
+
+        Parameters
+        ----------
+        repository : str
+            The name of the repository, as ``owner/name``.
+        session : requests.Session, optional
+            Session to send requests with. Defaults to the shared session.
+        """
+        super().__init__(repository, session)
+        self._api_url = f"https://api.github.com/repos/{repository}/pulls"
+        self._headers = {"Authorization": f"Bearer {os.getenv('GITHUB_TOKEN')}"}
+        self._repository_node_id: Optional[str] = None
+        # Pull requests created in bulk only carry some of the fields of the
+        # REST responses create_pull_request returns, so they are remembered
+        # separately
+        self._created_bulk: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
+
+    def invalidate(self, pr_info: PullRequestInfo) -> None:
+        """
+        Forget a created pull request, so it can be created again.
+
+        Use this once the pull request has been merged or closed.
+
+        Parameters
+        ----------
+        pr_info : PullRequestInfo
+            Information about the pull request.
+        """
+        super().invalidate(pr_info)
+        self._created_bulk.pop(_pr_key(pr_info), None)
+
+    @property
+    def _repository_id(self) -> str:
+        """
+        The GraphQL node ID of the repository, looked up on first use.
+        """
+        if self._repository_node_id is None:
+            owner, name = self.repository.split("/")
+            data = self._graphql(
+                "query($owner: String!, $name: String!) "
+                "{ repository(owner: $owner, name: $name) { id } }",
+                {"owner": owner, "name": name},
+            )
+            self._repository_node_id = data["repository"]["id"]
+        return self._repository_node_id
+
+    def _graphql(self, query: str, variables: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run a GraphQL query against the GitHub API.
+
+        Parameters
+        ----------
+        query : str
+            The GraphQL query or mutation.
+        variables : Dict[str, Any]
+            Values for the variables declared in `query`.
+
+        Returns
+        -------
+        Dict[str, Any]
+            The `data` member of the response.
+
+        Raises
+        ------
+        requests.exceptions.RequestException
+            If there's an error in the API request.
+        ProviderError
+            If the response reports GraphQL errors.
+        """
+        result = self._post(
+            self.GRAPHQL_URL, {"query": query, "variables": variables}, self._headers
+        )
+        if result.get("errors"):
+            raise ProviderError(
+                f"GitHub GraphQL request failed: {result['errors'][0].get('message')}",
+                errors=result["errors"],
+            )
+        return result["data"]
+
+    def create_pull_requests_bulk(
+        self, pr_infos: List[PullRequestInfo]
+    ) -> List[Dict[str, Any]]:
+        """
+        Create several pull requests on GitHub in a single request.
+
+        All pull requests are created by one GraphQL request holding an
+        aliased `createPullRequest` mutation for each of them. The
+        repository's node ID is looked up once per provider beforehand.
+        Pull requests this provider already created are not sent again;
+        for those created by `create_pull_request`, its REST response is
+        returned instead. The GraphQL results are converted to the field
+        names of the REST API, so every result can be read the same way.
+
+        Parameters
+        ----------
+        pr_infos : List[PullRequestInfo]
+            Information about each pull request.
+
+        Returns
+        -------
+        List[Dict[str, Any]]
+            Details of each pull request, in the order of `pr_infos`. Those
+            created in bulk have the `node_id`, `number`, `url` and
+            `html_url` fields of a REST response.
+
+        Raises
+        ------
+        requests.exceptions.RequestException
+            If there's an error in the API request.
+        ProviderError
+            If GitHub reports errors for any of the pull requests.
+        """
+        pending = {}
+        for pr_info in pr_infos:
+            key = _pr_key(pr_info)
+            if key not in self._created and key not in self._created_bulk:
+                pending[key] = pr_info
+        if pending:
+            self._create_pull_requests_graphql(pending)
+        results = []
+        for pr_info in pr_infos:
+            key = _pr_key(pr_info)
+            results.append(self._created_bulk.get(key) or self._created[key])
+        return results
+
+    def _create_pull_requests_graphql(
+        self, pending: Dict[Tuple[str, str, str], PullRequestInfo]
+    ) -> None:
+        """
+        Create pull requests with one GraphQL request and remember them.
+
+        Parameters
+        ----------
+        pending : dict
+            The pull requests to create, by `_pr_key`.
+
+        Raises
+        ------
+        requests.exceptions.RequestException
+            If there's an error in the API request.
+        ProviderError
+            If GitHub reports errors for any of the pull requests.
+        """
+        declarations = []
+        mutations = []
+        variables = {}
+        for i, pr_info in enumerate(pending.values()):
+            declarations.append(f"$pr{i}: CreatePullRequestInput!")
+            mutations.append(
+                f"pr{i}: createPullRequest(input: $pr{i}) "
+                "{ pullRequest { id number url } }"
+            )
+            variables[f"pr{i}"] = {
+                "repositoryId": self._repository_id,
+                "title": pr_info.title,
+                "headRefName": pr_info.head_branch,
+                "baseRefName": pr_info.base_branch,
+                "body": pr_info.description,
+                "maintainerCanModify": True,
+                "draft": False,
+            }
+        query = f"mutation({', '.join(declarations)}) {{ {' '.join(mutations)} }}"
+        data = self._graphql(query, variables)
+        for i, key in enumerate(pending):
+            node = data[f"pr{i}"]["pullRequest"]
+            self._created_bulk[key] = {
+                "node_id": node["id"],
+                "number": node["number"],
+                "url": f"{self._api_url}/{node['number']}",
+                "html_url": node["url"],
+            }
+
+    @_idempotent
     def create_pull_request(self, pr_info: PullRequestInfo) -> Dict[str, Any]:
         """
         Create a pull request on GitHub.
@@ -107,7 +527,6 @@ class GitHubProvider(BaseProvider):
         requests.exceptions.RequestException
             If there's an error in the API request.
         """
-        api_url = f"https://api.github.com/repos/{self.repository}/pulls"
         payload = {
             "title": pr_info.title,
             "head": pr_info.head_branch,
@@ -116,10 +535,7 @@ class GitHubProvider(BaseProvider):
             "maintainer_can_modify": True,
             "draft": False,
         }
-        headers = {"Authorization": f"Bearer {os.getenv('GITHUB_TOKEN')}"}
-        response = requests.post(api_url, json=payload, headers=headers)
-        response.raise_for_status()
-        return response.json()
+        return self._post(self._api_url, payload, self._headers)
 
 
 class BitbucketProvider(BaseProvider):
@@ -129,6 +545,26 @@ class BitbucketProvider(BaseProvider):
     This class implements the BaseProvider interface for Bitbucket repositories.
     """
 
+    def __init__(self, repository: str, session: Optional[requests.Session] = None):
+        """
+        Initialize the BitbucketProvider.
+
+        The API URL and the authorization headers are computed once here,
+        reading the token from the environment, rather than on every request.
+
+        Parameters
+        ----------
+        repository : str
+            The name of the repository, as ``workspace/repo_slug``.
+        session : requests.Session, optional
+            Session to send requests with. Defaults to the shared session.
+        """
+        super().__init__(repository, session)
+        workspace, repo_slug = repository.split("/")
+        self._api_url = f"https://api.bitbucket.org/2.0/repositories/{workspace}/{repo_slug}/pullrequests"
+        self._headers = {"Authorization": f"Bearer {os.getenv('BITBUCKET_TOKEN')}"}
+
+    @_idempotent
     def create_pull_request(self, pr_info: PullRequestInfo) -> Dict[str, Any]:
         """
         Create a pull request on Bitbucket.
@@ -148,8 +584,6 @@ class BitbucketProvider(BaseProvider):
         requests.exceptions.RequestException
             If there's an error in the API request.
         """
-        workspace, repo_slug = self.repository.split("/")
-        api_url = f"https://api.bitbucket.org/2.0/repositories/{workspace}/{repo_slug}/pullrequests"
         payload = {
             "title": pr_info.title,
             "source": {"branch": {"name": pr_info.head_branch}},
@@ -158,10 +592,7 @@ class BitbucketProvider(BaseProvider):
             "close_source_branch": pr_info.close_on_merge,
             "merge_strategy": "squash" if pr_info.rebase else "merge_commit",
         }
-        headers = {"Authorization": f"Bearer {os.getenv('BITBUCKET_TOKEN')}"}
-        response = requests.post(api_url, json=payload, headers=headers)
-        response.raise_for_status()
-        return response.json()
+        return self._post(self._api_url, payload, self._headers)
 
 
 class GitLabProvider(BaseProvider):
@@ -171,6 +602,25 @@ class GitLabProvider(BaseProvider):
     This class implements the BaseProvider interface for GitLab repositories.
     """
 
+    def __init__(self, repository: str, session: Optional[requests.Session] = None):
+        """
+        Initialize the GitLabProvider.
+
+        The API URL and the authorization headers are computed once here,
+        reading the token from the environment, rather than on every request.
+
+        Parameters
+        ----------
+        repository : str
+            The name of the repository, as ``namespace/project``.
+        session : requests.Session, optional
+            Session to send requests with. Defaults to the shared session.
+        """
+        super().__init__(repository, session)
+        self._api_url = f"https://gitlab.com/api/v4/projects/{repository.replace('/', '%2F')}/merge_requests"
+        self._headers = {"Authorization": f"Bearer {os.getenv('GITLAB_TOKEN')}"}
+
+    @_idempotent
     def create_pull_request(self, pr_info: PullRequestInfo) -> Dict[str, Any]:
         """
         Create a pull request on GitLab.
@@ -190,7 +640,6 @@ class GitLabProvider(BaseProvider):
         requests.exceptions.RequestException
             If there's an error in the API request.
         """
-        api_url = f"https://gitlab.com/api/v4/projects/{self.repository.replace('/', '%2F')}/merge_requests"
         payload = {
             "title": pr_info.title,
             "source_branch": pr_info.head_branch,
@@ -199,10 +648,7 @@ class GitLabProvider(BaseProvider):
             "remove_source_branch": pr_info.close_on_merge,
             "squash": pr_info.rebase,
         }
-        headers = {"Authorization": f"Bearer {os.getenv('GITLAB_TOKEN')}"}
-        response = requests.post(api_url, json=payload, headers=headers)
-        response.raise_for_status()
-        return response.json()
+        return self._post(self._api_url, payload, self._headers)
 
 
 class AWSCodeCommitProvider(BaseProvider):
@@ -212,6 +658,27 @@ class AWSCodeCommitProvider(BaseProvider):
     This class implements the BaseProvider interface for AWS CodeCommit repositories.
     """
 
+    def __init__(self, repository: str, session: Optional[requests.Session] = None):
+        """
+        Initialize the AWSCodeCommitProvider.
+
+        The API URL and the authorization headers are computed once here,
+        reading the token from the environment, rather than on every request.
+
+        Parameters
+        ----------
+        repository : str
+            The name of the repository, as ``repository-name``.
+        session : requests.Session, optional
+            Session to send requests with. Defaults to the shared session.
+        """
+        super().__init__(repository, session)
+        self._api_url = f"https://git-codecommit.us-east-1.amazonaws.com/v1/repos/{repository}/pull-requests"
+        self._headers = {
+            "Authorization": f"Bearer {os.getenv('AWS_ACCESS_KEY_ID')}:{os.getenv('AWS_SECRET_ACCESS_KEY')}"
+        }
+
+    @_idempotent
     def create_pull_request(self, pr_info: PullRequestInfo) -> Dict[str, Any]:
         """
         Create a pull request on AWS CodeCommit.
@@ -231,7 +698,6 @@ class AWSCodeCommitProvider(BaseProvider):
         requests.exceptions.RequestException
             If there's an error in the API request.
         """
-        api_url = f"https://git-codecommit.us-east-1.amazonaws.com/v1/repos/{self.repository}/pull-requests"
         payload = {
             "title": pr_info.title,
             "sourceReference": pr_info.head_branch,
@@ -242,12 +708,7 @@ class AWSCodeCommitProvider(BaseProvider):
             if pr_info.rebase
             else "THREE_WAY_MERGE",
         }
-        headers = {
-            "Authorization": f"Bearer {os.getenv('AWS_ACCESS_KEY_ID')}:{os.getenv('AWS_SECRET_ACCESS_KEY')}"
-        }
-        response = requests.post(api_url, json=payload, headers=headers)
-        response.raise_for_status()
-        return response.json()
+        return self._post(self._api_url, payload, self._headers)
 
 
 class AzureDevOpsProvider(BaseProvider):
@@ -257,6 +718,26 @@ class AzureDevOpsProvider(BaseProvider):
     This class implements the BaseProvider interface for Azure DevOps repositories.
     """
 
+    def __init__(self, repository: str, session: Optional[requests.Session] = None):
+        """
+        Initialize the AzureDevOpsProvider.
+
+        The API URL and the authorization headers are computed once here,
+        reading the token from the environment, rather than on every request.
+
+        Parameters
+        ----------
+        repository : str
+            The name of the repository, as ``organization/project/repo_slug``.
+        session : requests.Session, optional
+            Session to send requests with. Defaults to the shared session.
+        """
+        super().__init__(repository, session)
+        organization, project, repo_slug = repository.split("/")
+        self._api_url = f"https://dev.azure.com/{organization}/{project}/_apis/git/repositories/{repo_slug}/pullrequests?api-version=6.0"
+        self._headers = {"Authorization": f"Bearer {os.getenv('AZURE_DEVOPS_TOKEN')}"}
+
+    @_idempotent
     def create_pull_request(self, pr_info: PullRequestInfo) -> Dict[str, Any]:
         """
         Create a pull request on Azure DevOps.
@@ -276,8 +757,6 @@ class AzureDevOpsProvider(BaseProvider):
         requests.exceptions.RequestException
             If there's an error in the API request.
         """
-        organization, project, repo_slug = self.repository.split("/")
-        api_url = f"https://dev.azure.com/{organization}/{project}/_apis/git/repositories/{repo_slug}/pullrequests?api-version=6.0"
         payload = {
             "title": pr_info.title,
             "sourceRefName": f"refs/heads/{pr_info.head_branch}",
@@ -288,10 +767,7 @@ class AzureDevOpsProvider(BaseProvider):
                 "squashMerge": pr_info.rebase,
             },
         }
-        headers = {"Authorization": f"Bearer {os.getenv('AZURE_DEVOPS_TOKEN')}"}
-        response = requests.post(api_url, json=payload, headers=headers)
-        response.raise_for_status()
-        return response.json()
+        return self._post(self._api_url, payload, self._headers)
 
 
 class GitProviderFactory:
@@ -304,6 +780,9 @@ class GitProviderFactory:
         """
         Get the appropriate Git provider based on the server type.
 
+        Providers are cached, so repeated calls for the same server and
+        repository return the same instance and share its connection pool.
+
         Parameters
         ----------
         git_server : str
@@ -321,14 +800,70 @@ class GitProviderFactory:
         ValueError
             If the git_server type is unsupported.
         """
-        providers = {
-            "github": GitHubProvider,
-            "bitbucket": BitbucketProvider,
-            "gitlab": GitLabProvider,
-            "aws": AWSCodeCommitProvider,
-            "azure": AzureDevOpsProvider,
-        }
-        provider_class = providers.get(git_server.lower())
+        provider_class = _PROVIDERS.get(git_server.lower())
         if not provider_class:
             raise ValueError(f"Unsupported git_server: {git_server}")
-        return provider_class(repository)
+        return _get_provider(provider_class, repository)
+
+
+_PROVIDERS: Dict[str, Type[BaseProvider]] = {
+    "github": GitHubProvider,
+    "bitbucket": BitbucketProvider,
+    "gitlab": GitLabProvider,
+    "aws": AWSCodeCommitProvider,
+    "azure": AzureDevOpsProvider,
+}
+
+
+@lru_cache(maxsize=32)
+def _get_provider(provider_class: Type[BaseProvider], repository: str) -> BaseProvider:
+    """
+    Create a provider, or return the one already created for the repository.
+
+    Parameters
+    ----------
+    provider_class : type
+        The provider class to instantiate.
+    repository : str
+        The repository name.
+
+    Returns
+    -------
+    BaseProvider
+        The provider instance.
+    """
+    return provider_class(repository)
+
+
+def create_pull_requests(
+    jobs: Iterable[Tuple[BaseProvider, PullRequestInfo]],
+    max_workers: Optional[int] = POOL_SIZE,
+) -> List[Dict[str, Any]]:
+    """
+    Create several pull requests concurrently.
+
+    Each request spends nearly all its time waiting on the network, so
+    running them in threads makes the total time close to that of the
+    slowest request rather than the sum of all of them. Jobs may mix
+    providers and repositories.
+
+    Parameters
+    ----------
+    jobs : iterable of (BaseProvider, PullRequestInfo)
+        The provider to use and the pull request to create with it.
+    max_workers : int, optional
+        Maximum number of requests in flight (default is `POOL_SIZE`, the
+        number of pooled connections per provider).
+
+    Returns
+    -------
+    List[Dict[str, Any]]
+        Details of the created pull requests, in the order of `jobs`.
+
+    Raises
+    ------
+    requests.exceptions.RequestException
+        If any of the API requests fails.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(lambda job: job[0].create_pull_request(job[1]), jobs))
@@ -6,14 +6,102 @@ to Git repositories. It orchestrates the file operations, Git operations,
 and uses the configured Git provider.
 """
 
+import hashlib
+import logging
+import os
+import shutil
+import stat
+import subprocess
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional
 
 from gitmirror.config import ConfigProvider
+from gitmirror.exceptions import MirrorError
 from gitmirror.operations.file import FileTreeHandler
 from gitmirror.operations.git import GitOperations
-from gitmirror.providers import BaseProvider
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None  # type: ignore[assignment]
+
+if TYPE_CHECKING:
+    from gitmirror.providers import BaseProvider
+
+logger = logging.getLogger(__name__)
+
+ROLLBACK_PUSH_TIMEOUT = 30
+
+
+@contextmanager
+def _locked(lock_path: Path) -> Iterator[None]:
+    """
+    Hold an exclusive lock on a file for the duration of the block.
+
+    Where `fcntl` is unavailable no lock is taken.
+
+    Parameters
+    ----------
+    lock_path : Path
+        Path to the lock file, created if missing.
+    """
+    with open(lock_path, "w") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _default_clone_dir() -> Path:
+    """
+    Get the per-user directory where clones are kept between runs.
+
+    Returns
+    -------
+    Path
+        ``git-mirror`` under ``$XDG_CACHE_HOME``, or under ``~/.cache`` if
+        that is not set.
+    """
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return Path(cache_home) / "git-mirror"
+
+
+def _ensure_private_dir(path: Path) -> None:
+    """
+    Create a directory only the current user can access, or check an existing one.
+
+    Clones kept in the directory are fetched into and pushed from, so a
+    directory another user can write to would let them plant hooks or
+    configuration that run as the current user.
+
+    Parameters
+    ----------
+    path : Path
+        The directory, created with mode 0700 if missing.
+
+    Raises
+    ------
+    MirrorError
+        If the path is not a directory, or where ownership can be checked,
+        if it is owned by another user or accessible to other users.
+    """
+    path.mkdir(mode=0o700, parents=True, exist_ok=True)
+    st = os.lstat(path)
+    if not stat.S_ISDIR(st.st_mode):
+        raise MirrorError(f"Clone directory {path} is not a directory")
+    if hasattr(os, "getuid") and (st.st_uid != os.getuid() or st.st_mode & 0o077):
+        raise MirrorError(
+            f"Clone directory {path} must be owned by the current user and "
+            "not accessible to other users"
+        )
 
 
 class MirrorService:
@@ -25,7 +113,7 @@ class MirrorService:
         self,
         config: ConfigProvider,
         file_tree_handler: FileTreeHandler,
-        git_provider: BaseProvider,
+        git_provider: "BaseProvider",
         git_ops: GitOperations = GitOperations,
         folders_to_include: List[str] = None,
     ):
@@ -46,17 +134,96 @@ class MirrorService:
         self.git_provider = git_provider
         self.git_ops = git_ops
         self.folders_to_include = folders_to_include or []
+        self._repo_cache_dir: Optional[Path] = None
+        # Settings that do not change between runs are read once
+        self._base_path = Path(config.get("Paths", "base_path")).resolve()
+        self._commit_msg = config.get("Git", "commit_msg")
+        self._base_branch = config.get("Git", "base_branch", fallback="main")
+        self._new_branch = config.get("Git", "new_branch")
+        self._reuse_clone = (
+            config.get("Git", "reuse_clone", fallback="false").lower() == "true"
+        )
+        clone_dir = config.get("Git", "clone_dir")
+        self._clone_dir = (
+            Path(clone_dir).expanduser() if clone_dir else _default_clone_dir()
+        )
+        self._delete_missing = (
+            config.get("Git", "delete_missing", fallback="false").lower() == "true"
+        )
+
+    def _cached_repo_path(self, base_branch: str) -> Path:
+        """
+        Get the persistent clone directory for this repository and branch.
+
+        Parameters
+        ----------
+        base_branch : str
+            Name of the branch that is cloned.
+
+        Returns
+        -------
+        Path
+            A directory under `Git.clone_dir`, or the per-user cache
+            directory by default, unique to the repository, branch and
+            sparse checkout folders.
+
+        Raises
+        ------
+        MirrorError
+            If the clone directory can be accessed by other users.
+        """
+        if self._repo_cache_dir is None:
+            _ensure_private_dir(self._clone_dir)
+            key = "\0".join(
+                [self.git_provider.repository, base_branch] + self.folders_to_include
+            )
+            digest = hashlib.sha1(key.encode()).hexdigest()[:16]
+            self._repo_cache_dir = self._clone_dir / digest
+        return self._repo_cache_dir
+
+    def _prepare_repository(
+        self, repo_path: Path, base_branch: str, reuse_clone: bool
+    ) -> None:
+        """
+        Clone the repository, or refresh a clone kept from a previous run.
+
+        If refreshing a kept clone fails, it is removed and cloned again.
+
+        Parameters
+        ----------
+        repo_path : Path
+            Where the repository is, or should be, cloned.
+        base_branch : str
+            Name of the branch to check out.
+        reuse_clone : bool
+            Whether an existing clone at `repo_path` may be refreshed.
+        """
+        if reuse_clone and (repo_path / ".git").is_dir():
+            try:
+                self.git_ops.refresh_repository(str(repo_path), base_branch)
+                return
+            except subprocess.CalledProcessError:
+                shutil.rmtree(repo_path, ignore_errors=True)
+        self.git_ops.clone_repository(
+            self.git_provider.repository,
+            base_branch,
+            str(repo_path),
+            self.folders_to_include,
+        )
 
     def mirror_file_tree(self) -> Dict[str, Any]:
         """
         Mirror the file tree from source to destination Git repository.
 
         This method performs the following steps:
-        1. Clone the repository
-        2. Detect changes between the source and destination
-        3. Copy the file tree, updating only changed files
-        4. Commit and push changes if any are detected
-        5. Handle errors and perform rollback if necessary
+        1. Clone the repository, or refresh the clone kept from the previous
+           run if `Git.reuse_clone` is enabled, while hashing the source tree
+        2. Detect changes between the source and destination. Files missing
+           from the source are only deleted if `Git.delete_missing` is
+           enabled, and only within the included folders
+        3. If there are any, copy the changed files, then commit and push them
+        4. Handle errors, rolling back if the failure happened after files
+           were copied into the repository
 
         Returns
         -------
@@ -68,52 +235,81 @@ class MirrorService:
             - 'commit_hash': Hash of the commit (for successful operations with changes)
             - 'message': Description of the result or error message
         """
-        base_path = Path(self.config.get("Paths", "base_path")).resolve()
-        commit_msg = self.config.get("Git", "commit_msg")
-        base_branch = self.config.get("Git", "base_branch", fallback="main")
-        new_branch = self.config.get("Git", "new_branch")
-        ignore_patterns = self.config.get(
-            "Filters", "ignore_patterns", fallback=""
-        ).split(",")
         changes = {}
+        stage = "clone"
 
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_repo_path = Path(temp_dir) / "repo"
+        with ExitStack() as stack:
             try:
-                self.git_ops.clone_repository(
-                    self.git_provider.repository,
-                    base_branch,
-                    str(temp_repo_path),
-                    self.folders_to_include,
-                )
+                if self._reuse_clone:
+                    temp_repo_path = self._cached_repo_path(self._base_branch)
+                    stack.enter_context(_locked(temp_repo_path.with_suffix(".lock")))
+                else:
+                    temp_dir = stack.enter_context(tempfile.TemporaryDirectory())
+                    temp_repo_path = Path(temp_dir) / "repo"
+                # The clone waits on the network, so hash the source meanwhile
+                with ThreadPoolExecutor(max_workers=1) as executor:
+                    hashing = executor.submit(
+                        self.file_tree_handler.hash_source_tree, self._base_path
+                    )
+                    self._prepare_repository(
+                        temp_repo_path, self._base_branch, self._reuse_clone
+                    )
+                    src_hashes = hashing.result()
+                stage = "detect"
                 changes = self.file_tree_handler.detect_file_changes(
-                    base_path, temp_repo_path
+                    self._base_path,
+                    temp_repo_path,
+                    src_hashes,
+                    delete_missing=self._delete_missing,
+                    folders=self.folders_to_include,
                 )
-                self.file_tree_handler.copy_file_tree(
-                    base_path, temp_repo_path, ignore_patterns
-                )
-
-                if changes:
-                    commit_hash = self.git_ops.push_changes(
-                        str(temp_repo_path), commit_msg, new_branch
-                    )
-                    return {
-                        "status": "success",
-                        "changes": changes,
-                        "commit_hash": commit_hash,
-                    }
-                else:
+                if not changes:
                     return {
                         "status": "success",
                         "changes": {},
                         "message": "No changes detected",
                     }
 
-            except Exception as e:
-                self.git_ops.create_rollback_commit(temp_repo_path, changes)
-                self.git_ops.push_changes(
-                    str(temp_repo_path),
-                    "Rollback: Undoing last mirror operation",
-                    new_branch,
+                stage = "copy"
+                self.file_tree_handler.copy_file_tree(
+                    self._base_path, temp_repo_path, src_hashes, changes
                 )
+                stage = "push"
+                commit_hash = self.git_ops.push_changes(
+                    str(temp_repo_path), self._commit_msg, self._new_branch
+                )
+                return {
+                    "status": "success",
+                    "changes": changes,
+                    "commit_hash": commit_hash,
+                }
+
+            except Exception as e:
+                if stage in ("copy", "push") and changes:
+                    self._rollback(temp_repo_path, changes)
                 return {"status": "error", "message": str(e)}
+
+    def _rollback(self, repo_path: Path, changes: Dict[str, str]) -> None:
+        """
+        Undo copied changes and push the rollback, on a best-effort basis.
+
+        A failed rollback is logged rather than raised, so it cannot hide
+        the error that triggered it.
+
+        Parameters
+        ----------
+        repo_path : Path
+            Path to the local repository.
+        changes : dict
+            Dictionary of changed files with their change types.
+        """
+        try:
+            self.git_ops.create_rollback_commit(repo_path, changes)
+            self.git_ops.push_changes(
+                str(repo_path),
+                "Rollback: Undoing last mirror operation",
+                self._new_branch,
+                timeout=ROLLBACK_PUSH_TIMEOUT,
+            )
+        except Exception as rollback_error:
+            logger.warning("Rollback failed: %s", rollback_error)
@@ -1,12 +1,19 @@
+import gc
 import json
 import os
 import shutil
+import weakref
 from pathlib import Path
 from unittest.mock import Mock, patch
 
 import pytest
 
-from gitmirror.operations.file import FileCache, FileTreeHandler
+from gitmirror.operations.file import (
+    FileCache,
+    FileTreeHandler,
+    _flush_live_caches,
+    _iter_files,
+)
 
 # FileCache Tests
 
@@ -21,20 +28,36 @@ def test_file_cache_initialization(temp_cache_file):
     cache = FileCache(temp_cache_file)
     assert cache.cache_file == temp_cache_file
     assert cache.cache == {}
+    assert not hasattr(cache, "__dict__")
 
 
 def test_file_cache_load_existing_cache(temp_cache_file):
-    initial_cache = {"file1.txt": "hash1", "file2.txt": "hash2"}
+    files = {"file1.txt": {"h": "hash1", "s": 5, "m": 10}, "file2.txt": {"h": "hash2"}}
     with open(temp_cache_file, "w") as f:
-        json.dump(initial_cache, f)
+        json.dump({"version": FileCache.CACHE_VERSION, "files": files}, f)
 
     cache = FileCache(temp_cache_file)
-    assert cache.cache == initial_cache
+    assert cache.cache == files
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {"file1.txt": "hash1", "file2.txt": "hash2"},
+        {"version": 2, "files": {"file1.txt": {"h": "hash1", "s": 5, "m": 10}}},
+    ],
+)
+def test_file_cache_discards_old_versions(temp_cache_file, data):
+    with open(temp_cache_file, "w") as f:
+        json.dump(data, f)
+
+    cache = FileCache(temp_cache_file)
+    assert cache.cache == {}
 
 
 def test_file_cache_get_hash(temp_cache_file):
     cache = FileCache(temp_cache_file)
-    cache.cache = {"file1.txt": "hash1"}
+    cache.cache = {"file1.txt": {"h": "hash1"}}
 
     assert cache.get_hash("file1.txt") == "hash1"
     assert cache.get_hash("non_existent.txt") is None
@@ -45,10 +68,119 @@ def test_file_cache_update_hash(temp_cache_file):
     cache.update_hash("new_file.txt", "new_hash")
 
     assert cache.get_hash("new_file.txt") == "new_hash"
+    assert not os.path.exists(temp_cache_file)
+
+    cache.flush()
 
     with open(temp_cache_file, "r") as f:
         saved_cache = json.load(f)
-    assert saved_cache == {"new_file.txt": "new_hash"}
+    assert saved_cache == {
+        "version": FileCache.CACHE_VERSION,
+        "files": {"new_file.txt": {"h": "new_hash"}},
+    }
+
+
+def test_file_cache_lookup(temp_cache_file):
+    cache = FileCache(temp_cache_file)
+    cache.update_hash("file.txt", "hash", size=5, mtime_ns=10)
+
+    assert cache.lookup("file.txt", 5, 10) == "hash"
+    assert cache.lookup("file.txt", 6, 10) is None
+    assert cache.lookup("file.txt", 5, 11) is None
+    assert cache.lookup("other.txt", 5, 10) is None
+
+
+def test_file_cache_flush_with_orjson(temp_cache_file):
+    cache = FileCache(temp_cache_file)
+    cache.update_hash("new_file.txt", "new_hash")
+
+    with patch("gitmirror.operations.file.orjson") as mock_orjson:
+        mock_orjson.dumps.side_effect = lambda obj: json.dumps(obj).encode()
+        cache.flush()
+
+    mock_orjson.dumps.assert_called_once_with(
+        {"version": FileCache.CACHE_VERSION, "files": cache.cache}
+    )
+    assert FileCache(temp_cache_file).cache == cache.cache
+    assert not os.path.exists(f"{temp_cache_file}.tmp")
+
+
+def test_file_cache_load_with_orjson(temp_cache_file):
+    files = {"file1.txt": {"h": "hash1", "s": 5, "m": 10}}
+    with open(temp_cache_file, "w") as f:
+        json.dump({"version": FileCache.CACHE_VERSION, "files": files}, f)
+
+    with patch("gitmirror.operations.file.orjson") as mock_orjson:
+        mock_orjson.loads.side_effect = json.loads
+        cache = FileCache(temp_cache_file)
+
+    mock_orjson.loads.assert_called_once()
+    assert cache.cache == files
+
+
+def test_file_cache_retain(temp_cache_file):
+    cache = FileCache(temp_cache_file)
+    cache.update_hash("kept.txt", "hash1")
+    cache.update_hash("gone.txt", "hash2")
+    cache.flush()
+
+    cache.retain(["kept.txt", "new.txt"])
+    cache.flush()
+
+    assert FileCache(temp_cache_file).cache == {"kept.txt": {"h": "hash1"}}
+
+
+def test_file_cache_flush_without_updates(temp_cache_file):
+    cache = FileCache(temp_cache_file)
+    cache.flush()
+
+    assert not os.path.exists(temp_cache_file)
+
+
+def test_live_file_caches_are_flushed_at_exit(temp_cache_file, tmp_path):
+    cache = FileCache(temp_cache_file)
+    cache.update_hash("file.txt", "hash")
+    dropped = FileCache(str(tmp_path / "dropped.json"))
+    dropped.update_hash("file.txt", "hash")
+    dropped_ref = weakref.ref(dropped)
+    del dropped
+    gc.collect()
+
+    _flush_live_caches()
+
+    assert dropped_ref() is None
+    assert not (tmp_path / "dropped.json").exists()
+    assert FileCache(temp_cache_file).get_hash("file.txt") == "hash"
+
+
+# File walker tests
+
+
+def test_iter_files(tmp_path):
+    (tmp_path / "a.txt").write_text("a")
+    (tmp_path / "sub" / "deeper").mkdir(parents=True)
+    (tmp_path / "sub" / "b.txt").write_text("bb")
+    (tmp_path / "sub" / "deeper" / "c.txt").write_text("ccc")
+    (tmp_path / "empty").mkdir()
+
+    files = {path: st.st_size for path, st in _iter_files(str(tmp_path))}
+
+    assert files == {
+        "a.txt": 1,
+        os.path.join("sub", "b.txt"): 2,
+        os.path.join("sub", "deeper", "c.txt"): 3,
+    }
+
+
+def test_iter_files_does_not_follow_directory_symlinks(tmp_path):
+    target = tmp_path / "target"
+    target.mkdir()
+    (target / "file.txt").write_text("content")
+    root = tmp_path / "root"
+    root.mkdir()
+    (root / "link").symlink_to(target, target_is_directory=True)
+
+    assert list(_iter_files(str(root))) == []
 
 
 # FileTreeHandler Tests
@@ -56,7 +188,9 @@ def test_file_cache_update_hash(temp_cache_file):
 
 @pytest.fixture
 def mock_file_cache():
-    return Mock(spec=FileCache)
+    mock = Mock(spec=FileCache)
+    mock.lookup.return_value = None
+    return mock
 
 
 @pytest.fixture
@@ -83,10 +217,26 @@ def test_file_tree_handler_initialization(
         ("file.log", ["*.log"], True),
         ("path/to/file.txt", ["path/to/*.txt"], True),
         ("file.tmp", ["*.tmp", "*.log"], True),
+        ("/base/dir/file.log", ["*.log"], True),
+        ("/base/path/to/file.txt", ["path/to/*.txt"], True),
+        ("foo/bar.txt", ["foo*"], False),
+        ("path/to/sub/file.txt", ["path/to/*.txt"], False),
+        ("file.tmp", ["*.log", " *.tmp"], True),
+        ("file.txt", [""], False),
+        ("file.txt", [], False),
     ],
 )
-def test_should_ignore(file_tree_handler, file_path, ignore_patterns, expected):
-    assert file_tree_handler.should_ignore(file_path, ignore_patterns) == expected
+def test_should_ignore(
+    mock_file_cache, mock_git_ops, file_path, ignore_patterns, expected
+):
+    handler = FileTreeHandler(mock_file_cache, mock_git_ops, ignore_patterns)
+    assert handler.should_ignore(file_path) == expected
+
+
+def test_ignore_patterns_are_compiled_once(mock_file_cache, mock_git_ops):
+    first = FileTreeHandler(mock_file_cache, mock_git_ops, ["*.log", "*.tmp"])
+    second = FileTreeHandler(mock_file_cache, mock_git_ops, ["*.log", "*.tmp"])
+    assert first._ignore_re is second._ignore_re
 
 
 @pytest.fixture
@@ -105,42 +255,237 @@ def mock_directory_structure(tmp_path):
 
 def test_copy_file_tree(file_tree_handler, mock_directory_structure):
     src_dir, dest_dir = mock_directory_structure
-    ignore_patterns = ["*.log"]
+    file_tree_handler = FileTreeHandler(
+        file_tree_handler.file_cache, file_tree_handler.git_ops, ["*.log"]
+    )
 
     file_tree_handler.git_ops.get_file_hash.side_effect = (
         lambda x: f"hash_of_{Path(x).name}"
     )
-    file_tree_handler.file_cache.get_hash.return_value = None
+    file_tree_handler.git_ops.list_index_hashes.return_value = {
+        "file2.txt": "hash_of_file2.txt",
+        "old_file.txt": "hash_of_old_file.txt",
+    }
+    (dest_dir / "old_file.txt").write_text("old content")
     file_tree_handler.git_ops.copy_file.side_effect = lambda src, dest: shutil.copy2(
         src, dest
     )
 
-    file_tree_handler.copy_file_tree(src_dir, dest_dir, ignore_patterns)
+    file_tree_handler.copy_file_tree(src_dir, dest_dir)
 
+    file_tree_handler.git_ops.copy_file.assert_called_once_with(
+        src_dir / "file1.txt", dest_dir / "file1.txt"
+    )
     assert (dest_dir / "file1.txt").exists()
-    assert (dest_dir / "file2.txt").exists()
     assert not (dest_dir / "ignoreme.log").exists()
-    assert file_tree_handler.git_ops.copy_file.call_count == 2
+    # Files missing from the source are only deleted when asked to
+    assert (dest_dir / "old_file.txt").exists()
 
 
 def test_detect_file_changes(file_tree_handler, mock_directory_structure):
     src_dir, dest_dir = mock_directory_structure
-    (dest_dir / "old_file.txt").write_text("old content")
 
-    file_tree_handler.git_ops.get_file_hash.side_effect = (
-        lambda x: f"hash_of_{Path(x).name}"
+    file_tree_handler.git_ops.get_file_hash.side_effect = lambda x: (
+        f"old_hash_of_{Path(x).name}"
+        if x.startswith(str(dest_dir))
+        else f"hash_of_{Path(x).name}"
     )
+    file_tree_handler.git_ops.list_index_hashes.return_value = {
+        "file1.txt": "hash_of_file1.txt",
+        "file2.txt": "old_hash_of_file2.txt",
+        "old_file.txt": "hash_of_old_file.txt",
+    }
 
     changes = file_tree_handler.detect_file_changes(src_dir, dest_dir)
 
+    file_tree_handler.git_ops.list_index_hashes.assert_called_once_with(str(dest_dir))
+    assert changes == {"file2.txt": "modified", "ignoreme.log": "added"}
+
+    changes = file_tree_handler.detect_file_changes(
+        src_dir, dest_dir, delete_missing=True
+    )
+
     assert changes == {
-        "file1.txt": "added",
-        "file2.txt": "added",
+        "file2.txt": "modified",
         "ignoreme.log": "added",
         "old_file.txt": "deleted",
     }
 
 
+def test_detect_file_changes_only_deletes_in_folders(file_tree_handler, tmp_path):
+    src_dir = tmp_path / "src"
+    (src_dir / "docs").mkdir(parents=True)
+    (src_dir / "docs" / "a.txt").write_text("a")
+    file_tree_handler.git_ops.get_file_hash.side_effect = (
+        lambda x: f"hash_of_{Path(x).name}"
+    )
+    # A cone-mode sparse checkout of docs also holds the root files
+    file_tree_handler.git_ops.list_index_hashes.return_value = {
+        "README.md": "hash_of_README.md",
+        "LICENSE": "hash_of_LICENSE",
+        os.path.join("docs", "a.txt"): "hash_of_a.txt",
+        os.path.join("docs", "target_only.txt"): "hash_of_target_only.txt",
+        os.path.join("docs-old", "b.txt"): "hash_of_b.txt",
+    }
+
+    changes = file_tree_handler.detect_file_changes(
+        src_dir, tmp_path / "dest", delete_missing=True, folders=["docs/"]
+    )
+
+    assert changes == {os.path.join("docs", "target_only.txt"): "deleted"}
+
+
+def test_detect_file_changes_skips_ignored_files(
+    mock_file_cache, mock_git_ops, mock_directory_structure
+):
+    src_dir, dest_dir = mock_directory_structure
+    handler = FileTreeHandler(mock_file_cache, mock_git_ops, ["*.log"])
+    mock_git_ops.get_file_hash.side_effect = lambda x: f"hash_of_{Path(x).name}"
+    mock_git_ops.list_index_hashes.return_value = {
+        "file1.txt": "hash_of_file1.txt",
+        "file2.txt": "hash_of_file2.txt",
+        "old.log": "hash_of_old.log",
+    }
+
+    assert handler.detect_file_changes(src_dir, dest_dir) == {}
+
+
+def test_detect_file_changes_reads_mismatching_files(
+    file_tree_handler, mock_directory_structure
+):
+    src_dir, dest_dir = mock_directory_structure
+    src_hashes = {
+        "file1.txt": "hash_of_file1.txt",
+        "file2.txt": "hash_of_file2.txt",
+        "ignoreme.log": "hash_of_ignoreme.log",
+        "unchanged.txt": "hash_of_unchanged.txt",
+    }
+    # Git converts the files on checkout (e.g. core.autocrlf), so no index
+    # hash matches the source; only file2.txt differs in the working tree
+    # and ignoreme.log is missing from it
+    file_tree_handler.git_ops.list_index_hashes.return_value = {
+        "file1.txt": "clean_hash_of_file1.txt",
+        "file2.txt": "clean_hash_of_file2.txt",
+        "ignoreme.log": "clean_hash_of_ignoreme.log",
+        "unchanged.txt": "hash_of_unchanged.txt",
+    }
+
+    def get_file_hash(path):
+        if path.endswith("ignoreme.log"):
+            raise FileNotFoundError(path)
+        return "hash_of_file1.txt" if path.endswith("file1.txt") else "other_hash"
+
+    file_tree_handler.git_ops.get_file_hash.side_effect = get_file_hash
+
+    changes = file_tree_handler.detect_file_changes(src_dir, dest_dir, src_hashes)
+
+    assert changes == {"file2.txt": "modified", "ignoreme.log": "modified"}
+    hashed = sorted(
+        call[0][0] for call in file_tree_handler.git_ops.get_file_hash.call_args_list
+    )
+    assert hashed == [
+        str(dest_dir / "file1.txt"),
+        str(dest_dir / "file2.txt"),
+        str(dest_dir / "ignoreme.log"),
+    ]
+
+
+def test_copy_file_tree_with_changes(file_tree_handler, mock_directory_structure):
+    src_dir, dest_dir = mock_directory_structure
+    src_hashes = {
+        "file1.txt": "hash_of_file1.txt",
+        "file2.txt": "hash_of_file2.txt",
+        "ignoreme.log": "hash_of_ignoreme.log",
+    }
+    changes = {"file1.txt": "modified", "old_file.txt": "deleted"}
+    (dest_dir / "old_file.txt").write_text("old content")
+
+    file_tree_handler.copy_file_tree(src_dir, dest_dir, src_hashes, changes)
+
+    file_tree_handler.git_ops.copy_file.assert_called_once_with(
+        src_dir / "file1.txt", dest_dir / "file1.txt"
+    )
+    assert not (dest_dir / "old_file.txt").exists()
+    file_tree_handler.git_ops.list_index_hashes.assert_not_called()
+
+
+def test_hash_source_tree(file_tree_handler, mock_directory_structure):
+    src_dir, _ = mock_directory_structure
+    (src_dir / "nested").mkdir()
+    (src_dir / "nested" / "file3.txt").write_text("content3")
+
+    file_tree_handler.git_ops.get_file_hash.side_effect = (
+        lambda x: f"hash_of_{Path(x).name}"
+    )
+
+    src_hashes = file_tree_handler.hash_source_tree(src_dir)
+
+    assert src_hashes == {
+        "file1.txt": "hash_of_file1.txt",
+        "file2.txt": "hash_of_file2.txt",
+        "ignoreme.log": "hash_of_ignoreme.log",
+        str(Path("nested") / "file3.txt"): "hash_of_file3.txt",
+    }
+
+
+def test_hash_source_tree_skips_ignored_files(
+    mock_file_cache, mock_git_ops, mock_directory_structure
+):
+    src_dir, _ = mock_directory_structure
+    (src_dir / "vendor").mkdir()
+    (src_dir / "vendor" / "lib.tmp").write_text("vendored")
+    handler = FileTreeHandler(mock_file_cache, mock_git_ops, ["*.log", "vendor/*"])
+    mock_git_ops.get_file_hash.side_effect = lambda x: f"hash_of_{Path(x).name}"
+
+    src_hashes = handler.hash_source_tree(src_dir)
+
+    assert src_hashes == {
+        "file1.txt": "hash_of_file1.txt",
+        "file2.txt": "hash_of_file2.txt",
+    }
+    hashed = {
+        Path(call[0][0]).name for call in mock_git_ops.get_file_hash.call_args_list
+    }
+    assert hashed == {"file1.txt", "file2.txt"}
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_hash_source_tree_max_workers(
+    mock_file_cache, mock_git_ops, mock_directory_structure, max_workers
+):
+    src_dir, _ = mock_directory_structure
+    mock_git_ops.get_file_hash.side_effect = lambda x: f"hash_of_{Path(x).name}"
+    handler = FileTreeHandler(mock_file_cache, mock_git_ops, max_workers=max_workers)
+
+    src_hashes = handler.hash_source_tree(src_dir)
+
+    assert src_hashes == {
+        "file1.txt": "hash_of_file1.txt",
+        "file2.txt": "hash_of_file2.txt",
+        "ignoreme.log": "hash_of_ignoreme.log",
+    }
+
+
+def test_precomputed_hashes_are_reused(file_tree_handler, mock_directory_structure):
+    src_dir, dest_dir = mock_directory_structure
+    src_hashes = {
+        "file1.txt": "hash_of_file1.txt",
+        "file2.txt": "hash_of_file2.txt",
+        "ignoreme.log": "hash_of_ignoreme.log",
+    }
+
+    file_tree_handler.git_ops.list_index_hashes.return_value = {
+        "file1.txt": "hash_of_file1.txt"
+    }
+
+    changes = file_tree_handler.detect_file_changes(src_dir, dest_dir, src_hashes)
+    file_tree_handler.copy_file_tree(src_dir, dest_dir, src_hashes)
+
+    assert changes == {"file2.txt": "added", "ignoreme.log": "added"}
+    file_tree_handler.git_ops.get_file_hash.assert_not_called()
+    assert file_tree_handler.git_ops.copy_file.call_count == 2
+
+
 # Integration test
 
 
@@ -150,11 +495,12 @@ def test_file_operations_integration(temp_cache_file, mock_directory_structure):
     git_ops = Mock()
     git_ops.get_file_hash.side_effect = lambda x: f"hash_of_{Path(x).name}"
     git_ops.copy_file = Mock(side_effect=lambda src, dest: shutil.copy2(src, dest))
+    git_ops.list_index_hashes.return_value = {}
 
-    handler = FileTreeHandler(cache, git_ops)
+    handler = FileTreeHandler(cache, git_ops, ["*.log"])
 
     # First run: copy all files
-    handler.copy_file_tree(src_dir, dest_dir, ["*.log"])
+    handler.copy_file_tree(src_dir, dest_dir, handler.hash_source_tree(src_dir))
 
     assert (dest_dir / "file1.txt").exists()
     assert (dest_dir / "file2.txt").exists()
@@ -162,16 +508,58 @@ def test_file_operations_integration(temp_cache_file, mock_directory_structure):
 
     # Modify a file and run again
     (src_dir / "file1.txt").write_text("modified content")
-    git_ops.get_file_hash.side_effect = (
-        lambda x: f"new_hash_of_{Path(x).name}"
-        if "file1.txt" in x
+    git_ops.get_file_hash.side_effect = lambda x: (
+        f"new_hash_of_{Path(x).name}"
+        if x == str(src_dir / "file1.txt")
         else f"hash_of_{Path(x).name}"
     )
+    git_ops.list_index_hashes.return_value = {
+        "file1.txt": "hash_of_file1.txt",
+        "file2.txt": "hash_of_file2.txt",
+    }
 
-    handler.copy_file_tree(src_dir, dest_dir, ["*.log"])
+    handler.copy_file_tree(src_dir, dest_dir, handler.hash_source_tree(src_dir))
 
     assert (dest_dir / "file1.txt").read_text() == "modified content"
     assert git_ops.copy_file.call_count == 3  # 2 from first run, 1 from second run
+    # Unchanged files are recognised from their stat info and not rehashed
+    hashed = [call[0][0] for call in git_ops.get_file_hash.call_args_list]
+    assert hashed.count(str(src_dir / "file2.txt")) == 1
+    assert FileCache(temp_cache_file).cache == cache.cache
+
+
+def test_hash_source_tree_records_every_hashed_file(
+    temp_cache_file, mock_directory_structure
+):
+    src_dir, _ = mock_directory_structure
+    git_ops = Mock()
+    git_ops.get_file_hash.side_effect = lambda x: f"hash_of_{Path(x).name}"
+    handler = FileTreeHandler(FileCache(temp_cache_file), git_ops)
+
+    first = handler.hash_source_tree(src_dir)
+    git_ops.reset_mock()
+    # A later run, with nothing copied in between, reads no file again
+    handler = FileTreeHandler(FileCache(temp_cache_file), git_ops)
+    second = handler.hash_source_tree(src_dir)
+
+    assert second == first
+    git_ops.get_file_hash.assert_not_called()
+
+
+def test_hash_source_tree_drops_removed_files(
+    temp_cache_file, mock_directory_structure
+):
+    src_dir, _ = mock_directory_structure
+    git_ops = Mock()
+    git_ops.get_file_hash.side_effect = lambda x: f"hash_of_{Path(x).name}"
+    handler = FileTreeHandler(FileCache(temp_cache_file), git_ops)
+    handler.hash_source_tree(src_dir)
+
+    (src_dir / "file2.txt").unlink()
+    handler = FileTreeHandler(FileCache(temp_cache_file), git_ops)
+    handler.hash_source_tree(src_dir)
+
+    assert set(FileCache(temp_cache_file).cache) == {"file1.txt", "ignoreme.log"}
 
 
 if __name__ == "__main__":
@@ -35,7 +35,7 @@ def test_clone_repository(mock_subprocess, temp_dir):
         git_url, base_branch, temp_repo_path, folders_to_include
     )
 
-    assert mock_run.call_count == 4
+    assert mock_run.call_count == 3
     mock_run.assert_any_call(
         [
             "git",
@@ -59,6 +59,33 @@ def test_clone_repository(mock_subprocess, temp_dir):
     )
 
 
+def test_clone_repository_without_folders(mock_subprocess, temp_dir):
+    mock_run, _ = mock_subprocess
+    temp_repo_path = str(temp_dir / "repo")
+
+    GitOperations.clone_repository(
+        "https://github.com/user/repo.git", "main", temp_repo_path, []
+    )
+
+    assert mock_run.call_count == 3
+    mock_run.assert_called_with(
+        ["git", "sparse-checkout", "disable"], cwd=temp_repo_path, check=True
+    )
+
+
+def test_refresh_repository(mock_subprocess, temp_dir):
+    mock_run, _ = mock_subprocess
+    repo_path = str(temp_dir / "repo")
+
+    GitOperations.refresh_repository(repo_path, "main")
+
+    assert [call[0][0] for call in mock_run.call_args_list] == [
+        ["git", "fetch", "origin", "main"],
+        ["git", "reset", "--hard", "origin/main"],
+        ["git", "clean", "-fd"],
+    ]
+
+
 @pytest.mark.parametrize("new_branch", [None, "feature-branch"])
 def test_push_changes(mock_subprocess, temp_dir, new_branch):
     mock_run, mock_check_output = mock_subprocess
@@ -68,17 +95,17 @@ def test_push_changes(mock_subprocess, temp_dir, new_branch):
 
     result = GitOperations.push_changes(temp_repo_path, commit_msg, new_branch)
 
-    assert mock_run.call_count == 3 if new_branch is None else 4
-    mock_run.assert_any_call(["git", "add", "."], cwd=temp_repo_path, check=True)
+    assert mock_run.call_count == 3
+    mock_run.assert_any_call(["git", "add", "-A"], cwd=temp_repo_path, check=True)
     mock_run.assert_any_call(
         ["git", "commit", "-m", commit_msg], cwd=temp_repo_path, check=True
     )
-    if new_branch:
-        mock_run.assert_any_call(
-            ["git", "checkout", "-b", new_branch], cwd=temp_repo_path, check=True
-        )
+    refspec = f"HEAD:refs/heads/{new_branch}" if new_branch else "HEAD"
     mock_run.assert_any_call(
-        ["git", "push", "origin", new_branch or "HEAD"], cwd=temp_repo_path, check=True
+        ["git", "push", "origin", refspec],
+        cwd=temp_repo_path,
+        check=True,
+        timeout=None,
     )
     mock_check_output.assert_called_once_with(
         ["git", "rev-parse", "HEAD"], cwd=temp_repo_path, universal_newlines=True
@@ -86,6 +113,31 @@ def test_push_changes(mock_subprocess, temp_dir, new_branch):
     assert result == "abcdef1234567890"
 
 
+def test_list_index_hashes(mock_subprocess, temp_dir):
+    _, mock_check_output = mock_subprocess
+    repo_path = str(temp_dir / "repo")
+    mock_check_output.return_value = (
+        b"H 100644 aaaa 0\tfile1.txt\0"
+        b"H 100755 bbbb 0\tdir/file 2.sh\0"
+        b"S 100644 cccc 0\toutside/file3.txt\0"
+        b"H 160000 dddd 0\tsubmodule\0"
+    )
+
+    result = GitOperations.list_index_hashes(repo_path)
+
+    mock_check_output.assert_called_once_with(
+        ["git", "ls-files", "--stage", "-t", "-z"], cwd=repo_path
+    )
+    assert result == {
+        "file1.txt": "aaaa",
+        os.path.join("dir", "file 2.sh"): "bbbb",
+    }
+
+
+def git_blob_hash(content):
+    return hashlib.sha1(b"blob %d\0" % len(content) + content).hexdigest()
+
+
 def test_get_file_hash(temp_dir):
     test_file = temp_dir / "test_file.txt"
     test_content = b"Hello, World!"
@@ -93,8 +145,20 @@ def test_get_file_hash(temp_dir):
 
     result = GitOperations.get_file_hash(str(test_file))
 
-    expected_hash = hashlib.md5(test_content).hexdigest()
-    assert result == expected_hash
+    assert result == git_blob_hash(test_content)
+
+
+@patch("gitmirror.operations.git.HASH_CHUNK_SIZE", 1000)
+def test_get_file_hash_without_file_digest(temp_dir):
+    test_file = temp_dir / "test_file.txt"
+    test_content = b"Hello, World!" * 1000
+    test_file.write_bytes(test_content)
+
+    with patch("gitmirror.operations.git.hashlib", MagicMock(wraps=hashlib)) as mock:
+        del mock.file_digest
+        result = GitOperations.get_file_hash(str(test_file))
+
+    assert result == git_blob_hash(test_content)
 
 
 def test_copy_file(temp_dir):
@@ -109,6 +173,22 @@ def test_copy_file(temp_dir):
     assert dest_file.read_text() == src_content
 
 
+@pytest.mark.parametrize(
+    "preserve_mode, expected_mode", [(True, 0o755), (False, 0o644)]
+)
+def test_copy_file_mode(temp_dir, preserve_mode, expected_mode):
+    src_file = temp_dir / "script.sh"
+    dest_file = temp_dir / "copy.sh"
+    src_file.write_text("#!/bin/sh")
+    src_file.chmod(0o755)
+    dest_file.write_text("")
+    dest_file.chmod(0o644)
+
+    GitOperations.copy_file(src_file, dest_file, preserve_mode=preserve_mode)
+
+    assert dest_file.stat().st_mode & 0o777 == expected_mode
+
+
 def test_create_rollback_commit(mock_subprocess, temp_dir):
     mock_run, _ = mock_subprocess
     repo_path = temp_dir / "repo"
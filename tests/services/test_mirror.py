@@ -1,22 +1,30 @@
+import os
+import subprocess
+import threading
+from pathlib import Path
 from unittest.mock import Mock, patch
 
 import pytest
 
 from gitmirror.exceptions import MirrorError
 from gitmirror.operations.git import GitOperations
-from gitmirror.services.mirror import MirrorService
+from gitmirror.services.mirror import ROLLBACK_PUSH_TIMEOUT, MirrorService
+
+CONFIG_VALUES = {
+    ("Paths", "base_path"): "/path/to/source",
+    ("Git", "commit_msg"): "Test commit",
+    ("Git", "base_branch"): "main",
+    ("Git", "new_branch"): "feature-branch",
+    ("Filters", "ignore_patterns"): "*.log,*.tmp",
+}
 
 
 @pytest.fixture
 def mock_config():
     config = Mock()
-    config.get.side_effect = lambda section, key, fallback=None: {
-        ("Paths", "base_path"): "/path/to/source",
-        ("Git", "commit_msg"): "Test commit",
-        ("Git", "base_branch"): "main",
-        ("Git", "new_branch"): "feature-branch",
-        ("Filters", "ignore_patterns"): "*.log,*.tmp",
-    }.get((section, key), fallback)
+    config.get.side_effect = lambda section, key, fallback=None: CONFIG_VALUES.get(
+        (section, key), fallback
+    )
     return config
 
 
@@ -68,11 +76,46 @@ def test_mirror_file_tree_success_with_changes(
         "commit_hash": "abcdef1234567890",
     }
     mock_git_ops.clone_repository.assert_called_once()
-    mock_file_tree_handler.detect_file_changes.assert_called_once()
-    mock_file_tree_handler.copy_file_tree.assert_called_once()
+    mock_file_tree_handler.hash_source_tree.assert_called_once()
+    src_hashes = mock_file_tree_handler.hash_source_tree.return_value
+    assert mock_file_tree_handler.detect_file_changes.call_args[0][2] is src_hashes
+    mock_file_tree_handler.copy_file_tree.assert_called_once_with(
+        mock_file_tree_handler.detect_file_changes.call_args[0][0],
+        mock_file_tree_handler.detect_file_changes.call_args[0][1],
+        src_hashes,
+        changes,
+    )
     mock_git_ops.push_changes.assert_called_once()
 
 
+def test_mirror_file_tree_delete_missing(
+    mock_config, mock_file_tree_handler, mock_git_provider, mock_git_ops
+):
+    mock_file_tree_handler.detect_file_changes.return_value = {}
+    service = MirrorService(
+        mock_config, mock_file_tree_handler, mock_git_provider, mock_git_ops, ["docs"]
+    )
+
+    service.mirror_file_tree()
+
+    kwargs = mock_file_tree_handler.detect_file_changes.call_args[1]
+    assert kwargs == {"delete_missing": False, "folders": ["docs"]}
+
+    values = {("Git", "delete_missing"): "true"}
+    get = mock_config.get.side_effect
+    mock_config.get.side_effect = lambda section, key, fallback=None: values.get(
+        (section, key), get(section, key, fallback)
+    )
+    service = MirrorService(
+        mock_config, mock_file_tree_handler, mock_git_provider, mock_git_ops, ["docs"]
+    )
+
+    service.mirror_file_tree()
+
+    kwargs = mock_file_tree_handler.detect_file_changes.call_args[1]
+    assert kwargs == {"delete_missing": True, "folders": ["docs"]}
+
+
 def test_mirror_file_tree_success_no_changes(
     mirror_service, mock_git_ops, mock_file_tree_handler
 ):
@@ -90,10 +133,41 @@ def test_mirror_file_tree_success_no_changes(
     }
     mock_git_ops.clone_repository.assert_called_once()
     mock_file_tree_handler.detect_file_changes.assert_called_once()
-    mock_file_tree_handler.copy_file_tree.assert_called_once()
+    mock_file_tree_handler.copy_file_tree.assert_not_called()
     mock_git_ops.push_changes.assert_not_called()
 
 
+def test_mirror_file_tree_hashes_while_cloning(
+    mirror_service, mock_git_ops, mock_file_tree_handler
+):
+    hashing_started = threading.Event()
+
+    def clone(*args):
+        # The clone only finishes once hashing has started alongside it
+        assert hashing_started.wait(timeout=5)
+
+    mock_file_tree_handler.hash_source_tree.side_effect = (
+        lambda base_path: hashing_started.set() or {}
+    )
+    mock_git_ops.clone_repository.side_effect = clone
+    mock_file_tree_handler.detect_file_changes.return_value = {}
+
+    result = mirror_service.mirror_file_tree()
+
+    assert result["status"] == "success"
+    mock_file_tree_handler.detect_file_changes.assert_called_once()
+
+
+def test_config_is_read_once(mirror_service, mock_config, mock_file_tree_handler):
+    mock_file_tree_handler.detect_file_changes.return_value = {}
+    mock_config.get.reset_mock()
+
+    mirror_service.mirror_file_tree()
+    mirror_service.mirror_file_tree()
+
+    mock_config.get.assert_not_called()
+
+
 def test_mirror_file_tree_error(mirror_service, mock_git_ops, mock_file_tree_handler):
     # Setup
     mock_git_ops.clone_repository.side_effect = Exception("Git error")
@@ -104,8 +178,39 @@ def test_mirror_file_tree_error(mirror_service, mock_git_ops, mock_file_tree_han
     # Assert
     assert result == {"status": "error", "message": "Git error"}
     mock_git_ops.clone_repository.assert_called_once()
+    # Nothing was copied yet, so there is nothing to roll back
+    mock_git_ops.create_rollback_commit.assert_not_called()
+    mock_git_ops.push_changes.assert_not_called()
+
+
+def test_mirror_file_tree_error_after_copy(
+    mirror_service, mock_git_ops, mock_file_tree_handler
+):
+    changes = {"file1.txt": "modified"}
+    mock_file_tree_handler.detect_file_changes.return_value = changes
+    mock_git_ops.push_changes.side_effect = [Exception("Push rejected"), None]
+
+    result = mirror_service.mirror_file_tree()
+
+    assert result == {"status": "error", "message": "Push rejected"}
     mock_git_ops.create_rollback_commit.assert_called_once()
-    mock_git_ops.push_changes.assert_called_once()
+    assert mock_git_ops.create_rollback_commit.call_args[0][1] == changes
+    assert mock_git_ops.push_changes.call_count == 2
+    assert mock_git_ops.push_changes.call_args[1]["timeout"] == ROLLBACK_PUSH_TIMEOUT
+
+
+def test_mirror_file_tree_failed_rollback_is_logged(
+    mirror_service, mock_git_ops, mock_file_tree_handler, caplog
+):
+    mock_file_tree_handler.detect_file_changes.return_value = {"file1.txt": "added"}
+    mock_file_tree_handler.copy_file_tree.side_effect = Exception("Disk full")
+    mock_git_ops.create_rollback_commit.side_effect = Exception("No backup")
+
+    result = mirror_service.mirror_file_tree()
+
+    assert result == {"status": "error", "message": "Disk full"}
+    mock_git_ops.push_changes.assert_not_called()
+    assert "Rollback failed: No backup" in caplog.text
 
 
 @patch("gitmirror.services.mirror.tempfile.TemporaryDirectory")
@@ -125,5 +230,70 @@ def test_mirror_file_tree_temp_directory_usage(
     )
 
 
+def test_mirror_file_tree_reuses_clone(
+    tmp_path,
+    monkeypatch,
+    mock_config,
+    mock_file_tree_handler,
+    mock_git_provider,
+    mock_git_ops,
+):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    values = {("Git", "reuse_clone"): "true"}
+    get = mock_config.get.side_effect
+    mock_config.get.side_effect = lambda section, key, fallback=None: values.get(
+        (section, key), get(section, key, fallback)
+    )
+    mock_file_tree_handler.detect_file_changes.return_value = {}
+    service = MirrorService(
+        mock_config, mock_file_tree_handler, mock_git_provider, mock_git_ops
+    )
+
+    # First run: nothing to reuse yet
+    service.mirror_file_tree()
+    repo_path = mock_git_ops.clone_repository.call_args[0][2]
+    assert Path(repo_path).parent == tmp_path / "git-mirror"
+    assert (tmp_path / "git-mirror").stat().st_mode & 0o777 == 0o700
+    (Path(repo_path) / ".git").mkdir(parents=True)
+
+    # Second run: the clone is refreshed
+    service.mirror_file_tree()
+    mock_git_ops.clone_repository.assert_called_once()
+    mock_git_ops.refresh_repository.assert_called_once_with(repo_path, "main")
+
+    # Third run: refreshing fails, so the clone is recreated
+    mock_git_ops.refresh_repository.side_effect = subprocess.CalledProcessError(
+        1, "git"
+    )
+    service.mirror_file_tree()
+    assert mock_git_ops.clone_repository.call_count == 2
+    assert mock_git_ops.clone_repository.call_args[0][2] == repo_path
+    assert not Path(repo_path).exists()
+
+
+@pytest.mark.skipif(not hasattr(os, "getuid"), reason="POSIX permissions only")
+def test_mirror_file_tree_rejects_shared_clone_dir(
+    tmp_path, mock_config, mock_file_tree_handler, mock_git_provider, mock_git_ops
+):
+    clone_dir = tmp_path / "clones"
+    clone_dir.mkdir(mode=0o777)
+    clone_dir.chmod(0o777)
+    values = {("Git", "reuse_clone"): "true", ("Git", "clone_dir"): str(clone_dir)}
+    get = mock_config.get.side_effect
+    mock_config.get.side_effect = lambda section, key, fallback=None: values.get(
+        (section, key), get(section, key, fallback)
+    )
+    service = MirrorService(
+        mock_config, mock_file_tree_handler, mock_git_provider, mock_git_ops
+    )
+
+    result = service.mirror_file_tree()
+
+    assert result["status"] == "error"
+    assert "not accessible to other users" in result["message"]
+    mock_git_ops.clone_repository.assert_not_called()
+    assert list(clone_dir.iterdir()) == []
+
+
 if __name__ == "__main__":
     pytest.main()
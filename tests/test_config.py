@@ -1,12 +1,16 @@
 import configparser
+import copy
+import os
+import shutil
+import tempfile
 from pathlib import Path
 
 import pytest
 
-from gitmirror.config import DictConfigProvider, IniConfigProvider
+from gitmirror.config import DictConfigProvider, IniConfigProvider, _parse_ini
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_ini_content():
     return """
 [Section1]
@@ -18,14 +22,30 @@ key3 = value3
 """
 
 
-@pytest.fixture
-def sample_ini_file(tmp_path, sample_ini_content):
-    ini_file = tmp_path / "test_config.ini"
-    ini_file.write_text(sample_ini_content)
-    return str(ini_file)
+SHM_DIR = Path("/dev/shm")
+
+
+@pytest.fixture(scope="session")
+def sample_ini_file(tmp_path_factory, sample_ini_content):
+    """The sample INI file, kept in RAM-backed /dev/shm where available."""
+    if SHM_DIR.is_dir() and os.access(SHM_DIR, os.W_OK):
+        with tempfile.TemporaryDirectory(dir=SHM_DIR) as base:
+            ini_file = Path(base) / "test_config.ini"
+            ini_file.write_text(sample_ini_content)
+            yield str(ini_file)
+    else:
+        ini_file = tmp_path_factory.mktemp("cfg") / "test_config.ini"
+        ini_file.write_text(sample_ini_content)
+        yield str(ini_file)
 
 
 @pytest.fixture
+def fresh_ini_file(tmp_path, sample_ini_file):
+    """A copy of the sample INI file for tests that modify it."""
+    return shutil.copy(sample_ini_file, tmp_path / "test_config.ini")
+
+
+@pytest.fixture(scope="session")
 def sample_dict_config():
     return {
         "Section1": {"key1": "value1", "key2": "value2"},
@@ -33,38 +53,106 @@ def sample_dict_config():
     }
 
 
+@pytest.fixture
+def fresh_dict_config(sample_dict_config):
+    """A copy of the sample dictionary for tests that modify it."""
+    return copy.deepcopy(sample_dict_config)
+
+
+@pytest.fixture(scope="session")
+def shared_ini_provider(sample_ini_file):
+    """A provider for the sample INI file, shared by read-only tests."""
+    return IniConfigProvider(sample_ini_file)
+
+
 class TestIniConfigProvider:
-    def test_initialization(self, sample_ini_file):
-        provider = IniConfigProvider(sample_ini_file)
-        assert isinstance(provider.config, configparser.ConfigParser)
+    def test_initialization(self, shared_ini_provider):
+        assert isinstance(shared_ini_provider.config, configparser.ConfigParser)
 
-    def test_get_existing_value(self, sample_ini_file):
-        provider = IniConfigProvider(sample_ini_file)
-        assert provider.get("Section1", "key1") == "value1"
-        assert provider.get("Section2", "key3") == "value3"
+    def test_get_existing_value(self, shared_ini_provider):
+        assert shared_ini_provider.get("Section1", "key1") == "value1"
+        assert shared_ini_provider.get("Section2", "key3") == "value3"
 
-    def test_get_non_existing_value(self, sample_ini_file):
-        provider = IniConfigProvider(sample_ini_file)
+    def test_get_non_existing_value(self, shared_ini_provider):
+        provider = shared_ini_provider
         assert provider.get("Section1", "non_existing", fallback="default") == "default"
         assert (
             provider.get("NonExistingSection", "key", fallback="default") == "default"
         )
 
-    def test_set_existing_value(self, sample_ini_file):
-        provider = IniConfigProvider(sample_ini_file)
+    def test_set_existing_value(self, fresh_ini_file):
+        provider = IniConfigProvider(fresh_ini_file)
         provider.set("Section1", "key1", "new_value")
         assert provider.get("Section1", "key1") == "new_value"
 
-    def test_set_new_value(self, sample_ini_file):
-        provider = IniConfigProvider(sample_ini_file)
+    def test_set_new_value(self, fresh_ini_file):
+        provider = IniConfigProvider(fresh_ini_file)
         provider.set("Section1", "new_key", "new_value")
         assert provider.get("Section1", "new_key") == "new_value"
 
-    def test_set_new_section(self, sample_ini_file):
-        provider = IniConfigProvider(sample_ini_file)
+    def test_set_new_section(self, fresh_ini_file):
+        provider = IniConfigProvider(fresh_ini_file)
         provider.set("NewSection", "new_key", "new_value")
         assert provider.get("NewSection", "new_key") == "new_value"
 
+    def test_get_matches_configparser(self, tmp_path):
+        ini_file = tmp_path / "interpolated.ini"
+        ini_file.write_text(
+            "[DEFAULT]\nroot = /srv\n\n[Paths]\nBase_Path = %(root)s/data\n"
+        )
+        provider = IniConfigProvider(str(ini_file))
+        assert provider.get("Paths", "base_path") == "/srv/data"
+        assert provider.get("Paths", "BASE_PATH") == "/srv/data"
+        assert provider.get("Paths", "root") == "/srv"
+
+    def test_get_default_section(self, tmp_path):
+        ini_file = tmp_path / "defaults.ini"
+        ini_file.write_text(
+            "[DEFAULT]\nroot = /srv\ndata = %(root)s/data\n\n[Paths]\nkey = value\n"
+        )
+        provider = IniConfigProvider(str(ini_file))
+        assert provider.get("DEFAULT", "root") == "/srv"
+        assert provider.get("DEFAULT", "data") == "/srv/data"
+        assert provider.get("DEFAULT", "key", fallback="missing") == "missing"
+
+    def test_set_reinterpolates_section(self, tmp_path):
+        ini_file = tmp_path / "interpolated.ini"
+        ini_file.write_text("[Paths]\nroot = /srv\nbase_path = %(root)s/data\n")
+        provider = IniConfigProvider(str(ini_file))
+        provider.set("Paths", "root", "/opt")
+        assert provider.get("Paths", "base_path") == "/opt/data"
+
+    def test_interpolation_errors_are_raised_on_read(self, tmp_path):
+        ini_file = tmp_path / "percent.ini"
+        ini_file.write_text(
+            "[Paths]\nbase_path = /srv\n\n[PullRequest]\ndescription = 50%\n"
+        )
+        provider = IniConfigProvider(str(ini_file))
+        assert provider.get("Paths", "base_path") == "/srv"
+        with pytest.raises(configparser.InterpolationSyntaxError):
+            provider.get("PullRequest", "description")
+
+    def test_parsed_file_is_cached(self, sample_ini_file):
+        _parse_ini.cache_clear()
+        IniConfigProvider(sample_ini_file)
+        IniConfigProvider(sample_ini_file)
+        assert _parse_ini.cache_info().hits == 1
+        assert _parse_ini.cache_info().misses == 1
+
+    def test_edited_file_is_parsed_again(self, fresh_ini_file):
+        IniConfigProvider(fresh_ini_file)
+        with open(fresh_ini_file, "a") as f:
+            f.write("key4 = value4\n")
+        st = os.stat(fresh_ini_file)
+        os.utime(fresh_ini_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1))
+
+        provider = IniConfigProvider(fresh_ini_file)
+        assert provider.get("Section2", "key4") == "value4"
+
+    def test_set_does_not_leak_into_cache(self, sample_ini_file):
+        IniConfigProvider(sample_ini_file).set("Section1", "key1", "new_value")
+        assert IniConfigProvider(sample_ini_file).get("Section1", "key1") == "value1"
+
 
 class TestDictConfigProvider:
     def test_initialization(self, sample_dict_config):
@@ -83,18 +171,18 @@ class TestDictConfigProvider:
             provider.get("NonExistingSection", "key", fallback="default") == "default"
         )
 
-    def test_set_existing_value(self, sample_dict_config):
-        provider = DictConfigProvider(sample_dict_config)
+    def test_set_existing_value(self, fresh_dict_config):
+        provider = DictConfigProvider(fresh_dict_config)
         provider.set("Section1", "key1", "new_value")
         assert provider.get("Section1", "key1") == "new_value"
 
-    def test_set_new_value(self, sample_dict_config):
-        provider = DictConfigProvider(sample_dict_config)
+    def test_set_new_value(self, fresh_dict_config):
+        provider = DictConfigProvider(fresh_dict_config)
         provider.set("Section1", "new_key", "new_value")
         assert provider.get("Section1", "new_key") == "new_value"
 
-    def test_set_new_section(self, sample_dict_config):
-        provider = DictConfigProvider(sample_dict_config)
+    def test_set_new_section(self, fresh_dict_config):
+        provider = DictConfigProvider(fresh_dict_config)
         provider.set("NewSection", "new_key", "new_value")
         assert provider.get("NewSection", "new_key") == "new_value"
 
@@ -1,9 +1,11 @@
 import argparse
 from typing import Any, Dict
-from unittest.mock import Mock, patch
+from unittest.mock import DEFAULT, Mock, create_autospec, patch
 
 import pytest
 
+import gitmirror.mirror as mirror_module
+import gitmirror.services.mirror as service_module
 from gitmirror.exceptions import MirrorError
 from gitmirror.mirror import (
     create_pull_request,
@@ -12,59 +14,111 @@ from gitmirror.mirror import (
     run_mirror_process,
     setup_components,
 )
-
-
-@pytest.fixture
+from gitmirror.operations.file import FileTreeHandler
+from gitmirror.providers import BaseProvider, GitProviderFactory
+
+CONFIG_VALUES = {
+    ("Cache", "cache_file"): "file_cache.json",
+    ("Repository", "git_server"): "github",
+    ("Repository", "repository"): "user/repo",
+    ("PullRequest", "create"): "true",
+    ("PullRequest", "title"): "Test PR",
+    ("PullRequest", "description"): "Test Description",
+    ("Git", "new_branch"): "feature-branch",
+    ("Git", "base_branch"): "main",
+    ("PullRequest", "close_on_merge"): "true",
+    ("PullRequest", "rebase"): "true",
+}
+
+
+@pytest.fixture(scope="module")
 def mock_config():
     config = Mock()
-    config.get.side_effect = lambda section, key, fallback=None: {
-        ("Cache", "cache_file"): "file_cache.json",
-        ("Repository", "git_server"): "github",
-        ("Repository", "repository"): "user/repo",
-        ("PullRequest", "create"): "true",
-        ("PullRequest", "title"): "Test PR",
-        ("PullRequest", "description"): "Test Description",
-        ("Git", "new_branch"): "feature-branch",
-        ("Git", "base_branch"): "main",
-        ("PullRequest", "close_on_merge"): "true",
-        ("PullRequest", "rebase"): "true",
-    }.get((section, key), fallback)
+    config.get.side_effect = lambda section, key, fallback=None: CONFIG_VALUES.get(
+        (section, key), fallback
+    )
     return config
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_file_tree_handler():
-    return Mock()
+    return create_autospec(FileTreeHandler, instance=True)
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_git_provider():
-    return Mock()
+    return create_autospec(BaseProvider, instance=True)
 
 
-def test_parse_arguments():
-    with patch("sys.argv", ["mirror.py", "-c", "custom_config.ini"]):
-        args = parse_arguments()
-        assert args.config == "custom_config.ini"
-
-
-@patch("gitmirror.mirror.FileCache")
-@patch("gitmirror.mirror.GitOperations")
-@patch("gitmirror.mirror.FileTreeHandler")
-@patch("gitmirror.mirror.GitProviderFactory.get_provider")
-def test_setup_components(
-    mock_get_provider,
-    mock_file_tree_handler,
-    mock_git_ops,
-    mock_file_cache,
-    mock_config,
-):
-    mock_get_provider.return_value = Mock()
-    file_tree_handler, git_provider = setup_components(mock_config)
+@pytest.fixture(autouse=True)
+def _reset_mocks(mock_config, mock_file_tree_handler, mock_git_provider):
+    """Clear the calls recorded on the shared mocks after each test."""
+    yield
+    for mock in (mock_config, mock_file_tree_handler, mock_git_provider):
+        mock.reset_mock()
+
 
-    assert isinstance(file_tree_handler, Mock)
-    assert isinstance(git_provider, Mock)
-    mock_file_cache.assert_called_once_with("file_cache.json")
+@pytest.fixture
+def mirror_harness():
+    """Patch out `setup_components` and `MirrorService` for `mirror` tests."""
+    config = Mock()
+    config.get.side_effect = lambda section, key, fallback=None: (
+        "/path/to/base" if key == "base_path" else fallback
+    )
+    with patch.object(mirror_module, "setup_components") as mock_setup, patch.object(
+        service_module, "MirrorService"
+    ) as mock_mirror_service:
+        mock_setup.return_value = (Mock(), Mock(), Mock(), [])
+        mock_mirror_service.return_value.mirror_file_tree.return_value = {
+            "status": "success"
+        }
+        yield config, mock_setup, mock_mirror_service
+
+
+@pytest.mark.parametrize(
+    "argv, expected",
+    [
+        ([], "config.ini"),
+        (["-c", "custom_config.ini"], "custom_config.ini"),
+        (["--config", "custom_config.ini"], "custom_config.ini"),
+        (["--config=custom_config.ini"], "custom_config.ini"),
+    ],
+)
+def test_parse_arguments(argv, expected):
+    with patch("sys.argv", ["mirror.py"] + argv), patch(
+        "argparse.ArgumentParser"
+    ) as mock_parser:
+        args = parse_arguments()
+        assert args.config == expected
+        mock_parser.assert_not_called()
+
+
+def test_parse_arguments_falls_back_to_argparse(capsys):
+    with patch("sys.argv", ["mirror.py", "-cother.ini"]):
+        assert parse_arguments().config == "other.ini"
+    with patch("sys.argv", ["mirror.py", "--help"]), pytest.raises(SystemExit):
+        parse_arguments()
+    assert "--config" in capsys.readouterr().out
+
+
+def test_setup_components(mock_config):
+    with patch.multiple(
+        mirror_module,
+        FileCache=DEFAULT,
+        GitOperations=DEFAULT,
+        FileTreeHandler=DEFAULT,
+    ) as mocks, patch.object(GitProviderFactory, "get_provider") as mock_get_provider:
+        file_tree_handler, git_provider = setup_components(mock_config)
+
+    assert file_tree_handler is mocks["FileTreeHandler"].return_value
+    assert git_provider is mock_get_provider.return_value
+    mocks["FileCache"].assert_called_once_with("file_cache.json")
+    mocks["FileTreeHandler"].assert_called_once_with(
+        mocks["FileCache"].return_value,
+        mocks["GitOperations"].return_value,
+        ignore_patterns=[""],
+        max_workers=None,
+    )
     mock_get_provider.assert_called_once_with("github", "user/repo")
 
 
@@ -81,7 +135,7 @@ def test_create_pull_request(mock_config, mock_git_provider):
     assert call_args.rebase == True
 
 
-@patch("gitmirror.mirror.MirrorService")
+@patch.object(service_module, "MirrorService")
 def test_run_mirror_process(
     mock_mirror_service, mock_config, mock_file_tree_handler, mock_git_provider
 ):
@@ -98,25 +152,10 @@ def test_run_mirror_process(
     assert "pull_request" in result
 
 
-@patch("gitmirror.mirror.IniConfigProvider")
-@patch("gitmirror.mirror.DictConfigProvider")
-@patch("gitmirror.mirror.setup_components")
-@patch("gitmirror.mirror.MirrorService")
-def test_mirror_with_config_file(
-    mock_mirror_service, mock_setup, mock_dict_config, mock_ini_config
-):
-    mock_config = Mock()
+@patch.object(mirror_module, "IniConfigProvider")
+def test_mirror_with_config_file(mock_ini_config, mirror_harness):
+    mock_config, mock_setup, mock_mirror_service = mirror_harness
     mock_ini_config.return_value = mock_config
-    mock_setup.return_value = (Mock(), Mock(), Mock(), [])
-    mock_mirror_service_instance = Mock()
-    mock_mirror_service.return_value = mock_mirror_service_instance
-    mock_mirror_service_instance.mirror_file_tree.return_value = {"status": "success"}
-
-    mock_config.get.side_effect = (
-        lambda section, key, fallback=None: "/path/to/base"
-        if key == "base_path"
-        else fallback
-    )
 
     result = mirror(config_path="config.ini")
 
@@ -124,25 +163,13 @@ def test_mirror_with_config_file(
     mock_ini_config.assert_called_once_with("config.ini")
     mock_setup.assert_called_once_with(mock_config)
     mock_mirror_service.assert_called_once()
-    mock_mirror_service_instance.mirror_file_tree.assert_called_once()
+    mock_mirror_service.return_value.mirror_file_tree.assert_called_once()
 
 
-@patch("gitmirror.mirror.DictConfigProvider")
-@patch("gitmirror.mirror.setup_components")
-@patch("gitmirror.mirror.MirrorService")
-def test_mirror_with_config_params(mock_mirror_service, mock_setup, mock_dict_config):
-    mock_config = Mock()
+@patch.object(mirror_module, "DictConfigProvider")
+def test_mirror_with_config_params(mock_dict_config, mirror_harness):
+    mock_config, mock_setup, mock_mirror_service = mirror_harness
     mock_dict_config.return_value = mock_config
-    mock_setup.return_value = (Mock(), Mock(), Mock(), [])
-    mock_mirror_service_instance = Mock()
-    mock_mirror_service.return_value = mock_mirror_service_instance
-    mock_mirror_service_instance.mirror_file_tree.return_value = {"status": "success"}
-
-    mock_config.get.side_effect = (
-        lambda section, key, fallback=None: "/path/to/base"
-        if key == "base_path"
-        else fallback
-    )
 
     result = mirror(Repository__git_server="github", Repository__repository="user/repo")
 
@@ -150,11 +177,11 @@ def test_mirror_with_config_params(mock_mirror_service, mock_setup, mock_dict_co
     mock_dict_config.assert_called_once()
     mock_setup.assert_called_once_with(mock_config)
     mock_mirror_service.assert_called_once()
-    mock_mirror_service_instance.mirror_file_tree.assert_called_once()
+    mock_mirror_service.return_value.mirror_file_tree.assert_called_once()
 
 
-@patch("gitmirror.mirror.IniConfigProvider")
-@patch("gitmirror.mirror.setup_components")
+@patch.object(mirror_module, "IniConfigProvider")
+@patch.object(mirror_module, "setup_components")
 def test_mirror_with_error(mock_setup, mock_ini_config):
     mock_setup.side_effect = ValueError(
         "not enough values to unpack (expected 4, got 0)"
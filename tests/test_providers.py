@@ -1,9 +1,13 @@
-import os
+import dataclasses
+import json
 from unittest.mock import Mock, patch
 
 import pytest
 
+from gitmirror.exceptions import ProviderError
 from gitmirror.providers import (
+    DEFAULT_TIMEOUT,
+    RETRY,
     AWSCodeCommitProvider,
     AzureDevOpsProvider,
     BaseProvider,
@@ -12,10 +16,12 @@ from gitmirror.providers import (
     GitLabProvider,
     GitProviderFactory,
     PullRequestInfo,
+    create_pull_requests,
+    get_session,
 )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_pr_info():
     return PullRequestInfo(
         title="Test PR",
@@ -27,15 +33,35 @@ def sample_pr_info():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
+def other_pr_info(sample_pr_info):
+    return dataclasses.replace(sample_pr_info, head_branch="other-branch")
+
+
+def json_response(data):
+    response = Mock()
+    response.json.return_value = data
+    response.content = json.dumps(data).encode()
+    return response
+
+
+@pytest.fixture(scope="session")
 def mock_response():
-    mock = Mock()
-    mock.json.return_value = {
-        "id": 1,
-        "number": 101,
-        "html_url": "https://example.com/pr/101",
-    }
-    return mock
+    return json_response(
+        {
+            "id": 1,
+            "number": 101,
+            "html_url": "https://example.com/pr/101",
+        }
+    )
+
+
+@pytest.fixture(autouse=True)
+def mock_post(mock_response):
+    """Stop every test from reaching the network through the shared session."""
+    with patch("gitmirror.providers.requests.Session.post") as mock:
+        mock.return_value = mock_response
+        yield mock
 
 
 class TestPullRequestInfo:
@@ -53,6 +79,13 @@ class TestPullRequestInfo:
         assert pr_info.close_on_merge == True
         assert pr_info.rebase == True
 
+    def test_pull_request_info_is_immutable(self, sample_pr_info):
+        with pytest.raises(AttributeError):
+            sample_pr_info.title = "Other title"
+        assert hash(sample_pr_info) == hash(
+            PullRequestInfo("Test PR", "This is a test PR", "feature-branch", "main")
+        )
+
 
 class TestBaseProvider:
     def test_base_provider_initialization(self):
@@ -70,111 +103,288 @@ class TestBaseProvider:
         with pytest.raises(TypeError):
             BaseProvider("test/repo")
 
+    def test_session_retries_transient_errors(self):
+        provider = GitHubProvider("test/repo")
+        adapter = provider._session.get_adapter("https://api.github.com")
+        retries = adapter.max_retries
+        assert retries is RETRY
+        assert retries.is_retry("POST", 429, has_retry_after=True)
+        assert retries.is_retry("POST", 503)
+        assert not retries.is_retry("POST", 422)
+
+    def test_url_and_headers_are_computed_once(
+        self, mock_post, sample_pr_info, other_pr_info, mock_response, monkeypatch
+    ):
+        monkeypatch.setenv("AZURE_DEVOPS_TOKEN", "token")
+        provider = AzureDevOpsProvider("org/project/repo")
+        provider.create_pull_request(sample_pr_info)
+        monkeypatch.setenv("AZURE_DEVOPS_TOKEN", "rotated")
+        provider.create_pull_request(other_pr_info)
+        first, second = mock_post.call_args_list
+        assert first[0][0] is second[0][0]
+        assert second[1]["headers"]["Authorization"] == "Bearer token"
+
+    def test_response_parsing_without_orjson(self, mock_post, sample_pr_info):
+        response = json_response({"number": 101})
+        response.content = b"not used"
+        mock_post.return_value = response
+        with patch("gitmirror.providers.orjson", None):
+            result = GitHubProvider("test/repo").create_pull_request(sample_pr_info)
+        assert result == {"number": 101}
+
+    def test_session_is_shared(self):
+        github = GitHubProvider("test/repo")
+        gitlab = GitLabProvider("test/repo")
+        assert github._session is gitlab._session is get_session()
+
+        session = Mock()
+        assert GitHubProvider("test/repo", session=session)._session is session
+
+    def test_pull_requests_are_created_once(
+        self, mock_post, sample_pr_info, mock_response
+    ):
+        mock_post.side_effect = [Exception("Timeout"), mock_response, mock_response]
+        provider = GitHubProvider("test/repo")
+
+        with pytest.raises(Exception, match="Timeout"):
+            provider.create_pull_request(sample_pr_info)
+        first = provider.create_pull_request(sample_pr_info)
+        again = provider.create_pull_request(
+            dataclasses.replace(sample_pr_info, description="Edited")
+        )
+        assert again is first
+        assert mock_post.call_count == 2
+
+        provider.invalidate(sample_pr_info)
+        provider.create_pull_request(sample_pr_info)
+        assert mock_post.call_count == 3
+
+    def test_session_is_reused(
+        self, mock_post, sample_pr_info, other_pr_info, mock_response
+    ):
+        with patch("gitmirror.providers.requests.Session.close") as mock_close:
+            with GitHubProvider("test/repo") as provider:
+                session = provider._session
+                provider.create_pull_request(sample_pr_info)
+                provider.create_pull_request(other_pr_info)
+                assert provider._session is session
+            mock_close.assert_called_once()
+        assert mock_post.call_count == 2
+
+    def test_closing_keeps_the_shared_session_open(self):
+        other = GitLabProvider("test/repo")
+        with patch("gitmirror.providers.requests.Session.close") as mock_close:
+            with GitHubProvider("test/repo") as provider:
+                assert provider._session is not get_session()
+            GitHubProvider("test/repo").close()
+            GitHubProvider("test/repo", session=Mock()).close()
+            mock_close.assert_called_once()
+        assert provider._session is other._session is get_session()
+
+
+@pytest.mark.parametrize(
+    "provider_class,repository",
+    [
+        (GitHubProvider, "test/repo"),
+        (BitbucketProvider, "workspace/repo"),
+        (GitLabProvider, "group/project"),
+        (AWSCodeCommitProvider, "test-repo"),
+        (AzureDevOpsProvider, "org/project/repo"),
+    ],
+)
+def test_create_pull_request(
+    mock_post, provider_class, repository, sample_pr_info, mock_response
+):
+    provider = provider_class(repository)
+    result = provider.create_pull_request(sample_pr_info)
+    assert result == mock_response.json()
+    mock_post.assert_called_once()
+    assert mock_post.call_args[1]["timeout"] == DEFAULT_TIMEOUT
+
 
 class TestGitHubProvider:
-    @patch("gitmirror.providers.requests.post")
-    def test_create_pull_request(self, mock_post, sample_pr_info, mock_response):
-        mock_post.return_value = mock_response
+    def test_create_pull_requests_bulk(self, mock_post, sample_pr_info, other_pr_info):
+        repository_response = json_response({"data": {"repository": {"id": "R_1"}}})
+        mutation_response = json_response(
+            {
+                "data": {
+                    "pr0": {"pullRequest": {"id": "PR_1", "number": 1, "url": "u1"}},
+                    "pr1": {"pullRequest": {"id": "PR_2", "number": 2, "url": "u2"}},
+                }
+            }
+        )
+        mock_post.side_effect = [repository_response, mutation_response]
         provider = GitHubProvider("test/repo")
-        result = provider.create_pull_request(sample_pr_info)
-        assert result == mock_response.json()
-        mock_post.assert_called_once()
 
+        result = provider.create_pull_requests_bulk([sample_pr_info, other_pr_info])
 
-class TestBitbucketProvider:
-    @patch("gitmirror.providers.requests.post")
-    def test_create_pull_request(self, mock_post, sample_pr_info, mock_response):
-        mock_post.return_value = mock_response
-        provider = BitbucketProvider("workspace/repo")
-        result = provider.create_pull_request(sample_pr_info)
-        assert result == mock_response.json()
-        mock_post.assert_called_once()
+        assert result == [
+            {
+                "node_id": "PR_1",
+                "number": 1,
+                "url": "https://api.github.com/repos/test/repo/pulls/1",
+                "html_url": "u1",
+            },
+            {
+                "node_id": "PR_2",
+                "number": 2,
+                "url": "https://api.github.com/repos/test/repo/pulls/2",
+                "html_url": "u2",
+            },
+        ]
+        assert mock_post.call_count == 2
+        api_url = mock_post.call_args[0][0]
+        variables = mock_post.call_args[1]["json"]["variables"]
+        assert api_url == GitHubProvider.GRAPHQL_URL
+        assert variables["pr0"]["repositoryId"] == "R_1"
+        assert variables["pr1"]["headRefName"] == "other-branch"
 
+    def test_create_pull_requests_bulk_skips_created(
+        self, mock_post, sample_pr_info, other_pr_info, mock_response
+    ):
+        mutation_response = json_response(
+            {"data": {"pr0": {"pullRequest": {"id": "PR_2", "number": 2, "url": "u2"}}}}
+        )
+        mock_post.side_effect = [mock_response, mutation_response]
+        provider = GitHubProvider("test/repo")
+        provider._repository_node_id = "R_1"
 
-class TestGitLabProvider:
-    @patch("gitmirror.providers.requests.post")
-    def test_create_pull_request(self, mock_post, sample_pr_info, mock_response):
-        mock_post.return_value = mock_response
-        provider = GitLabProvider("group/project")
-        result = provider.create_pull_request(sample_pr_info)
-        assert result == mock_response.json()
-        mock_post.assert_called_once()
+        first = provider.create_pull_request(sample_pr_info)
+        result = provider.create_pull_requests_bulk([sample_pr_info, other_pr_info])
 
+        assert result[0] is first
+        assert result[1]["number"] == 2
+        assert result[1]["html_url"] == "u2"
+        variables = mock_post.call_args[1]["json"]["variables"]
+        assert list(variables) == ["pr0"]
+        assert variables["pr0"]["headRefName"] == "other-branch"
 
-class TestAWSCodeCommitProvider:
-    @patch("gitmirror.providers.requests.post")
-    def test_create_pull_request(self, mock_post, sample_pr_info, mock_response):
-        mock_post.return_value = mock_response
-        provider = AWSCodeCommitProvider("test-repo")
+    def test_bulk_results_are_not_returned_by_create_pull_request(
+        self, mock_post, sample_pr_info, mock_response
+    ):
+        mutation_response = json_response(
+            {"data": {"pr0": {"pullRequest": {"id": "PR_1", "number": 1, "url": "u1"}}}}
+        )
+        mock_post.side_effect = [mutation_response, mock_response]
+        provider = GitHubProvider("test/repo")
+        provider._repository_node_id = "R_1"
+
+        provider.create_pull_requests_bulk([sample_pr_info])
         result = provider.create_pull_request(sample_pr_info)
-        assert result == mock_response.json()
-        mock_post.assert_called_once()
 
+        assert result == mock_response.json.return_value
+        assert mock_post.call_args[0][0] == provider._api_url
 
-class TestAzureDevOpsProvider:
-    @patch("gitmirror.providers.requests.post")
-    def test_create_pull_request(self, mock_post, sample_pr_info, mock_response):
-        mock_post.return_value = mock_response
-        provider = AzureDevOpsProvider("org/project/repo")
-        result = provider.create_pull_request(sample_pr_info)
-        assert result == mock_response.json()
-        mock_post.assert_called_once()
+    def test_create_pull_requests_bulk_errors(self, mock_post, sample_pr_info):
+        mock_post.return_value = json_response(
+            {
+                "data": None,
+                "errors": [{"message": "Could not resolve to a Repository"}],
+            }
+        )
+        provider = GitHubProvider("test/repo")
+
+        with pytest.raises(ProviderError, match="Could not resolve") as exc_info:
+            provider.create_pull_requests_bulk([sample_pr_info])
+        assert len(exc_info.value.errors) == 1
+
+
+class TestGitLabProvider:
+    def test_create_pull_requests_bulk(
+        self, mock_post, sample_pr_info, other_pr_info, mock_response
+    ):
+        provider = GitLabProvider("test/repo")
+        result = provider.create_pull_requests_bulk([sample_pr_info, other_pr_info])
+        assert result == [mock_response.json(), mock_response.json()]
+        assert mock_post.call_count == 2
 
 
 class TestGitProviderFactory:
     @pytest.mark.parametrize(
-        "git_server,expected_provider",
+        "git_server,repository,expected_provider",
         [
-            ("github", GitHubProvider),
-            ("bitbucket", BitbucketProvider),
-            ("gitlab", GitLabProvider),
-            ("aws", AWSCodeCommitProvider),
-            ("azure", AzureDevOpsProvider),
+            ("github", "test/repo", GitHubProvider),
+            ("bitbucket", "test/repo", BitbucketProvider),
+            ("gitlab", "test/repo", GitLabProvider),
+            ("aws", "test-repo", AWSCodeCommitProvider),
+            ("azure", "test/project/repo", AzureDevOpsProvider),
         ],
     )
-    def test_get_provider(self, git_server, expected_provider):
-        provider = GitProviderFactory.get_provider(git_server, "test/repo")
+    def test_get_provider(self, git_server, repository, expected_provider):
+        provider = GitProviderFactory.get_provider(git_server, repository)
         assert isinstance(provider, expected_provider)
 
+    def test_get_provider_returns_cached_instance(self):
+        provider = GitProviderFactory.get_provider("github", "test/repo")
+        assert GitProviderFactory.get_provider("GitHub", "test/repo") is provider
+        assert GitProviderFactory.get_provider("github", "other/repo") is not provider
+
     def test_get_provider_unsupported(self):
         with pytest.raises(ValueError):
             GitProviderFactory.get_provider("unsupported", "test/repo")
 
 
 @pytest.mark.parametrize(
-    "provider_class,expected_token_env",
+    "provider_class,repository,env,expected_auth",
     [
-        (GitHubProvider, "GITHUB_TOKEN"),
-        (BitbucketProvider, "BITBUCKET_TOKEN"),
-        (GitLabProvider, "GITLAB_TOKEN"),
-        (AzureDevOpsProvider, "AZURE_DEVOPS_TOKEN"),
+        (GitHubProvider, "test/repo", {"GITHUB_TOKEN": "test_token"}, "test_token"),
+        (
+            BitbucketProvider,
+            "test/repo",
+            {"BITBUCKET_TOKEN": "test_token"},
+            "test_token",
+        ),
+        (GitLabProvider, "test/repo", {"GITLAB_TOKEN": "test_token"}, "test_token"),
+        (
+            AzureDevOpsProvider,
+            "test/project/repo",
+            {"AZURE_DEVOPS_TOKEN": "test_token"},
+            "test_token",
+        ),
+        (
+            AWSCodeCommitProvider,
+            "test-repo",
+            {"AWS_ACCESS_KEY_ID": "test_key", "AWS_SECRET_ACCESS_KEY": "test_secret"},
+            "test_key:test_secret",
+        ),
     ],
 )
-def test_provider_uses_correct_token(
-    provider_class, expected_token_env, sample_pr_info
+def test_provider_uses_correct_credentials(
+    mock_post,
+    provider_class,
+    repository,
+    env,
+    expected_auth,
+    sample_pr_info,
+    monkeypatch,
 ):
-    with patch("gitmirror.providers.requests.post") as mock_post, patch.dict(
-        os.environ, {expected_token_env: "test_token"}
-    ):
-        provider = provider_class(
-            "test/project/repo"
-            if provider_class == AzureDevOpsProvider
-            else "test/repo"
-        )
-        provider.create_pull_request(sample_pr_info)
-        called_headers = mock_post.call_args[1]["headers"]
-        assert called_headers["Authorization"] == "Bearer test_token"
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+    mock_post.return_value = json_response({})
+    provider = provider_class(repository)
+    provider.create_pull_request(sample_pr_info)
+    called_headers = mock_post.call_args[1]["headers"]
+    assert called_headers["Authorization"] == f"Bearer {expected_auth}"
 
 
-def test_aws_provider_uses_correct_credentials(sample_pr_info):
-    with patch("gitmirror.providers.requests.post") as mock_post, patch.dict(
-        os.environ,
-        {"AWS_ACCESS_KEY_ID": "test_key", "AWS_SECRET_ACCESS_KEY": "test_secret"},
-    ):
-        provider = AWSCodeCommitProvider("test-repo")
-        provider.create_pull_request(sample_pr_info)
-        called_headers = mock_post.call_args[1]["headers"]
-        assert called_headers["Authorization"] == "Bearer test_key:test_secret"
+def test_create_pull_requests(mock_post, sample_pr_info):
+    responses = {
+        "https://api.github.com/repos/test/repo/pulls": {"number": 1},
+        "https://gitlab.com/api/v4/projects/test%2Frepo/merge_requests": {"iid": 2},
+    }
+
+    def post(api_url, **kwargs):
+        return json_response(responses[api_url])
+
+    mock_post.side_effect = post
+    results = create_pull_requests(
+        [
+            (GitHubProvider("test/repo"), sample_pr_info),
+            (GitLabProvider("test/repo"), sample_pr_info),
+        ]
+    )
+
+    assert results == [{"number": 1}, {"iid": 2}]
 
 
 if __name__ == "__main__":